@@ -44,6 +44,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # Health probe short-circuit, skips everything below (incl. URL resolution)
+    'students_app.middleware.HealthCheckMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -76,10 +78,15 @@ WSGI_APPLICATION = 'config.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/6.0/ref/settings/#databases
 
+# In-memory test DB by default. Opt in to a file based one (TEST_DB_NAME=test_db.sqlite3),
+# so `manage.py test --keepdb` can reuse the migrated schema between runs
+TEST_DB_NAME = os.getenv('TEST_DB_NAME', '')
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        'TEST': {'NAME': BASE_DIR / TEST_DB_NAME if TEST_DB_NAME else None},
     }
 }
 
@@ -120,6 +127,30 @@ USE_TZ = True
 
 STATIC_URL = 'static/'
 
+# === Cache settings ===
+# Redis in production (set REDIS_URL), local memory cache otherwise (dev/tests).
+# Analytics cache and list ETags key off a data version bumped on every write. Local memory is per process,
+# so with more than one worker a bump isn't seen by the others: multi-worker deploys need REDIS_URL
+# (`manage.py check --deploy` warns, students_app.W001)
+REDIS_URL = os.getenv('REDIS_URL', '')
+
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
+# Analytics responses are invalidated on every data change, timeout is just a safety net
+ANALYTICS_CACHE_TIMEOUT = int(os.getenv('ANALYTICS_CACHE_TIMEOUT', '3600'))
+
 # === Admin page credentials ===
 SHOW_ADMIN_CREDS = os.getenv('SHOW_ADMIN_CREDS', '1').lower() in ('1', 'true', 'yes')
 ADMIN_USERNAME = os.getenv('DJANGO_SUPERUSER_USERNAME', 'admin')
@@ -131,4 +162,11 @@ REST_FRAMEWORK = {
     # Default pagination
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': int(os.getenv('API_PAGE_SIZE', '50')),
+    # orjson for JSON responses, browsable API kept for local debugging
+    'DEFAULT_RENDERER_CLASSES': [
+        'students_app.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    # DB constraint violations -> 400
+    'EXCEPTION_HANDLER': 'students_app.exceptions.api_exception_handler',
 }
\ No newline at end of file
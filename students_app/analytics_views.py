@@ -1,47 +1,51 @@
-from django.db.models import Count, Avg, Q, F, FloatField, Value
+from django.db.models import Count, Avg, Sum, Q, F, Case, When, IntegerField, Value
 from rest_framework.decorators import api_view
 from rest_framework.response import Response
-from django.db.models.functions import Cast
 from rest_framework import status
 
-from typing import Optional, Any
+from typing import Optional, Any, Callable
+import re
 
-from students_app.models import Student, Department
+from students_app.models import Student, StudentMetrics, Department
+from students_app.contstants import StressLevel, STRESS_LEVEL_MAP, normalize_str
+from students_app.cache import cached_payload, params_key
 
 
 
 # === HELPERS ===
+_TRUE_VALUES = frozenset(('1', 'true', 'yes', 'y', 't'))
+_FALSE_VALUES = frozenset(('0', 'false', 'no', 'n', 'f'))
+
 def _parse_bool(value: Optional[str]) -> Optional[bool]:
     if value is None:
         return None
 
     val = value.strip().lower()
 
-    if val in ('1', 'true', 'yes', 'y', 't'):
+    if val in _TRUE_VALUES:
         return True
 
-    if val in ('0', 'false', 'no', 'n', 'f'):
+    if val in _FALSE_VALUES:
         return False
 
     return None
 
+# Number formats accepted in query params (checked up front, so bad input never raises)
+_INT_RE = re.compile(r'\s*[+-]?\d+\s*')
+_FLOAT_RE = re.compile(r'\s*[+-]?(\d+\.?\d*|\.\d+)([eE][+-]?\d+)?\s*')
+
 def _parse_int(value: Optional[str]) -> Optional[int]:
-    if value is None or value == '':
+    if not value or not _INT_RE.fullmatch(value):
         return None
 
-    try:
-        return int(value)
-    except ValueError:
-        return None
+    return int(value)
 
 def _parse_float(value: Optional[str]) -> Optional[float]:
-    if value is None or value == '':
+    # Also keeps out 'nan'/'inf', which float() would happily accept
+    if not value or not _FLOAT_RE.fullmatch(value):
         return None
 
-    try:
-        return float(value)
-    except ValueError:
-        return None
+    return float(value)
 
 def _round(value, digits=2):
     if value is None:
@@ -57,15 +61,51 @@ def _limit(value: Optional[str], default: int = 50, max_value: int = 500) -> int
     return max(1, min(num, max_value))
 
 
-def _metrics_prefix() -> str:
+def _parse_str(value: Optional[str]) -> Optional[str]:
+    if value is None:
+        return None
+
+    return value.strip() or None
+
+# Stress level is stored as an int code, API speaks labels ('Bad', 'good', ...)
+STRESS_LABELS = dict(StressLevel.choices)
+
+def _stress_condition(label: str) -> Q:
     '''
-    Adjust this if your Student->StudentMetrics relation uses related_name='metrics'.
+    Filter students by stress label. Unknown label matches nothing (filtering on None would be IS NULL,
+    i.e. students w/o metrics)
     '''
-    return 'metrics'
+    code = STRESS_LEVEL_MAP.get(normalize_str(label))
+
+    if code is None:
+        return Q(pk__in=[])
+
+    return Q(metrics__stress_level=code)
+
+
+
+# === METRICS LOOKUPS (Student -> StudentMetrics relation uses related_name='metrics') ===
+M_COLLEGE_MARK = 'metrics__college_mark'
+M_STRESS_LEVEL = 'metrics__stress_level'
+M_PART_TIME_JOB = 'metrics__part_time_job'
+M_SALARY_EXPECTATION = 'metrics__salary_expectation'
+M_DAILY_STUDYING_TIME = 'metrics__daily_studying_time'
+M_WILLINGNESS_PERCENT = 'metrics__willingness_percent'
 
 
 
 # === ADV.ROUTE 1: Advanced students search route (multi-filtering) ===
+# Query param -> (parser, filter condition for the parsed value)
+SEARCH_FILTERS: dict[str, tuple[Callable[[Optional[str]], Any], Callable[[Any], Q]]] = {
+    'department': (_parse_int, lambda v: Q(department_id=v)),
+    'hobby': (_parse_int, lambda v: Q(hobby_id=v)),
+    'gender': (_parse_str, lambda v: Q(gender__iexact=v)),
+    'part_time_job': (_parse_bool, lambda v: Q(metrics__part_time_job=v)),
+    'stress_level': (_parse_str, _stress_condition),
+    'min_college_mark': (_parse_float, lambda v: Q(metrics__college_mark__gte=v)),
+    'max_college_mark': (_parse_float, lambda v: Q(metrics__college_mark__lte=v)),
+}
+
 @api_view(['GET'])
 def students_search(request):
     '''
@@ -74,97 +114,64 @@ def students_search(request):
     Returns a list of students with selected fields (not full serializer output).
     This endpoint proves understanding of multi-parameter filtering + joins.
     '''
-    prefix = _metrics_prefix()
-
-    # Join related entities
-    querySet = Student.objects.select_related('department', 'hobby')
-
-    # Parse and add filters if applicable
-    dept_id = _parse_int(request.query_params.get('department'))
-    if dept_id is not None:
-        querySet = querySet.filter(department_id=dept_id)
+    # Parse filters (parsed values are echoed back in response, and key the cached result)
+    filters: dict[str, Any] = {
+        param: parse(request.query_params.get(param)) for param, (parse, _) in SEARCH_FILTERS.items()
+    }
+    filters['limit'] = _limit(request.query_params.get('limit'), default=50, max_value=500)
 
-    hobby_id = _parse_int(request.query_params.get('hobby'))
-    if hobby_id is not None:
-        querySet = querySet.filter(hobby_id=hobby_id)
+    return Response(
+        cached_payload(params_key('students_search', filters), lambda: _students_search_payload(filters))
+    )
 
-    gender = request.query_params.get('gender')
-    if gender:
-        querySet = querySet.filter(gender__iexact=gender.strip())
 
-    part_time_job = _parse_bool(request.query_params.get('part_time_job'))
-    if part_time_job is not None:
-        querySet = querySet.filter(**{f'{prefix}__part_time_job': part_time_job})
+def _students_search_payload(filters: dict[str, Any]) -> dict[str, Any]:
+    # Add filters if applicable
+    conditions = Q()
 
-    stress_level = request.query_params.get('stress_level')
-    if stress_level:
-        querySet = querySet.filter(**{f'{prefix}__stress_level': stress_level})
+    for param, (_, to_condition) in SEARCH_FILTERS.items():
+        value = filters[param]
 
-    min_mark = _parse_float(request.query_params.get('min_college_mark'))
-    if min_mark is not None:
-        querySet = querySet.filter(**{f'{prefix}__college_mark__gte': min_mark})
+        if value is not None:
+            conditions &= to_condition(value)
 
-    max_mark = _parse_float(request.query_params.get('max_college_mark'))
-    if max_mark is not None:
-        querySet = querySet.filter(**{f'{prefix}__college_mark__lte': max_mark})
+    # Department/hobby names are denormalized on Student, so no joins needed for them
+    querySet = Student.objects.filter(conditions)
 
-    limit = _limit(request.query_params.get('limit'), default=50, max_value=500)
-
-    # Select suitable rows (up to the limit) for analytics/search
+    # Select suitable rows (up to the limit) for analytics/search, metrics columns come back already named as in response
     rows = (
         querySet.order_by('pk')
         .values(
-            'pk',
+            'id',
             'gender',
             'height_cm',
             'weight_kg',
-            'department__name',
-            'hobby__name',
-            f'{prefix}__college_mark',
-            f'{prefix}__stress_level',
-            f'{prefix}__part_time_job',
-            f'{prefix}__salary_expectation',
-            f'{prefix}__daily_studying_time',
-            f'{prefix}__willingness_percent',
-        )[:limit]
+            'department_name',
+            'hobby_name',
+            college_mark=F(M_COLLEGE_MARK),
+            stress_level=F(M_STRESS_LEVEL),
+            part_time_job=F(M_PART_TIME_JOB),
+            salary_expectation=F(M_SALARY_EXPECTATION),
+            daily_studying_time=F(M_DAILY_STUDYING_TIME),
+            willingness_percent=F(M_WILLINGNESS_PERCENT),
+        )[:filters['limit']]
     )
 
     results = []
-    # Populate result
-    for row in rows:
-        results.append(
-            {
-                'id': row['pk'],
-                'gender': row['gender'],
-                'department': row['department__name'],
-                'hobby': row['hobby__name'],
-                'height_cm': row['height_cm'],
-                'weight_kg': row['weight_kg'],
-                'college_mark': row[f'{prefix}__college_mark'],
-                'stress_level': row[f'{prefix}__stress_level'],
-                'part_time_job': row[f'{prefix}__part_time_job'],
-                'salary_expectation': row[f'{prefix}__salary_expectation'],
-                'daily_studying_time': row[f'{prefix}__daily_studying_time'],
-                'willingness_percent': row[f'{prefix}__willingness_percent'],
-            }
-        )
+    # Stream rows (no queryset result cache). Names can't be aliased as 'department'/'hobby' in DB
+    # since those clash with the FK fields, so they are renamed in place
+    for row in rows.iterator(chunk_size=100):
+        row['department'] = row.pop('department_name')
+        row['hobby'] = row.pop('hobby_name')
+        # Student w/o metrics row -> null
+        row['stress_level'] = STRESS_LABELS.get(row['stress_level'])
+        results.append(row)
 
-    return Response(
-        {
-            'filters': {
-                'department': dept_id,
-                'hobby': hobby_id,
-                'gender': gender,
-                'part_time_job': part_time_job,
-                'stress_level': stress_level,
-                'min_college_mark': min_mark,
-                'max_college_mark': max_mark,
-                'limit': limit,
-            },
-            'count': len(results),
-            'results': results,
-        }
-    )
+    return {
+        'filters': filters,
+        'count': len(results),
+        'results': results,
+    }
 
 
 
@@ -180,49 +187,44 @@ def departments_summary(request):
     - avg salary_expectation
     - stress distribution counts
     '''
-    prefix = _metrics_prefix()
+    return Response(cached_payload('dept_summary', _departments_summary_payload))
 
-    # Generate aggregates per department
-    querySet = (
-        Department.objects.all()
+
+# Stress level -> per-department count alias
+STRESS_COUNT_ALIASES = {level: f'stress_{level.label.lower()}' for level in StressLevel}
+
+def _departments_summary_payload() -> dict[str, Any]:
+    # Single GROUP BY department over the LEFT JOIN to metrics (one-to-one, so one row per student and no DISTINCT).
+    # Students are counted w/ or w/o a metrics row. Departments without students come back too, with zero counts
+    # and empty averages
+    rows = (
+        Department.objects.order_by('name')
+        .values('id', 'name')
         .annotate(
-            student_count=Count('students', distinct=True),
-            avg_college_mark=Avg(f'students__{prefix}__college_mark'),
-            avg_salary_expectation=Avg(f'students__{prefix}__salary_expectation'),
-            stress_good=Count('students', filter=Q(**{f'students__{prefix}__stress_level': 'Good'}), distinct=True),
-            stress_fair=Count('students', filter=Q(**{f'students__{prefix}__stress_level': 'Fair'}), distinct=True),
-            stress_bad=Count('students', filter=Q(**{f'students__{prefix}__stress_level': 'Bad'}), distinct=True),
-        )
-        .order_by('name')
-        .values(
-            'id',
-            'name',
-            'student_count',
-            'avg_college_mark',
-            'avg_salary_expectation',
-            'stress_good',
-            'stress_fair',
-            'stress_bad',
+            student_count=Count('students'),
+            avg_college_mark=Avg('students__metrics__college_mark'),
+            avg_salary_expectation=Avg('students__metrics__salary_expectation'),
+            **{
+                alias: Count('students__metrics', filter=Q(students__metrics__stress_level=level))
+                for level, alias in STRESS_COUNT_ALIASES.items()
+            },
         )
     )
 
-    results = [
-        {
-            'department_id': row['id'],
-            'department_name': row['name'],
-            'student_count': row['student_count'],
-            'avg_college_mark': _round(row['avg_college_mark']),
-            'avg_salary_expectation': _round(row['avg_salary_expectation']),
-            'stress_distribution': {
-                'Good': row['stress_good'],
-                'Fair': row['stress_fair'],
-                'Bad': row['stress_bad'],
-            },
-        }
-        for row in querySet
-    ]
+    results = []
+    for row in rows:
+        results.append(
+            {
+                'department_id': row['id'],
+                'department_name': row['name'],
+                'student_count': row['student_count'],
+                'avg_college_mark': _round(row['avg_college_mark']),
+                'avg_salary_expectation': _round(row['avg_salary_expectation']),
+                'stress_distribution': {level.label: row[alias] for level, alias in STRESS_COUNT_ALIASES.items()},
+            }
+        )
 
-    return Response({'count': len(results), 'results': results})
+    return {'count': len(results), 'results': results}
 
 
 
@@ -234,38 +236,46 @@ def parttime_impact(request):
 
     Compare average performance metrics for students with- and without part-time jobs.
     '''
-    prefix = _metrics_prefix()
+    return Response(cached_payload('parttime_impact', _parttime_impact_payload))
 
-    base = Student.objects.all()
 
-    # Aggregation helper
-    def _agg(part_time: bool) -> dict[str, Any]:
-        querySet = base.filter(**{f'{prefix}__part_time_job': part_time})
-
-        result = querySet.aggregate(
+def _parttime_impact_payload() -> dict[str, Any]:
+    # Aggregate both groups (with/without part-time job) in one grouped query
+    rows = (
+        StudentMetrics.objects.values('part_time_job')
+        .annotate(
             student_count=Count('pk'),
-            avg_college_mark=Avg(f'{prefix}__college_mark'),
-            avg_salary_expectation=Avg(f'{prefix}__salary_expectation'),
-            avg_willingness_percent=Avg(f'{prefix}__willingness_percent'),
+            avg_college_mark=Avg('college_mark'),
+            avg_salary_expectation=Avg('salary_expectation'),
+            avg_willingness_percent=Avg('willingness_percent'),
         )
+        .order_by()
+    )
 
-        # Roud up floats
-        result['avg_college_mark'] = _round(result['avg_college_mark'])
-        result['avg_salary_expectation'] = _round(result['avg_salary_expectation'])
-        result['avg_willingness_percent'] = _round(result['avg_willingness_percent'])
-
-        return result
-
-    # Aggregate for students with- and without part-time job
-    with_job = _agg(True)
-    without_job = _agg(False)
+    # Empty groups keep the same shape as aggregate() would return
+    groups: dict[bool, dict[str, Any]] = {
+        part_time: {
+            'student_count': 0,
+            'avg_college_mark': None,
+            'avg_salary_expectation': None,
+            'avg_willingness_percent': None,
+        }
+        for part_time in (True, False)
+    }
 
-    return Response(
-        {
-            'with_part_time_job': with_job,
-            'without_part_time_job': without_job,
+    for row in rows:
+        # Round up floats
+        groups[row['part_time_job']] = {
+            'student_count': row['student_count'],
+            'avg_college_mark': _round(row['avg_college_mark']),
+            'avg_salary_expectation': _round(row['avg_salary_expectation']),
+            'avg_willingness_percent': _round(row['avg_willingness_percent']),
         }
-    )
+
+    return {
+        'with_part_time_job': groups[True],
+        'without_part_time_job': groups[False],
+    }
 
 
 
@@ -280,17 +290,19 @@ def studytime_performance(request):
     - avg college_mark
     - avg willingness_percent
     '''
-    prefix = _metrics_prefix()
+    return Response(cached_payload('studytime_performance', _studytime_performance_payload))
 
-    # Select suitable rows
+
+def _studytime_performance_payload() -> dict[str, Any]:
+    # Group metrics directly (no Student join needed)
     querySet = (
-        Student.objects.values(f'{prefix}__daily_studying_time')
+        StudentMetrics.objects.values('daily_studying_time')
         .annotate(
             student_count=Count('pk'),
-            avg_college_mark=Avg(f'{prefix}__college_mark'),
-            avg_willingness_percent=Avg(f'{prefix}__willingness_percent'),
+            avg_college_mark=Avg('college_mark'),
+            avg_willingness_percent=Avg('willingness_percent'),
         )
-        .order_by(f'{prefix}__daily_studying_time')
+        .order_by('daily_studying_time')
     )
 
     # Populate results
@@ -298,14 +310,14 @@ def studytime_performance(request):
     for row in querySet:
         results.append(
             {
-                'daily_studying_time': row[f'{prefix}__daily_studying_time'],
+                'daily_studying_time': row['daily_studying_time'],
                 'student_count': row['student_count'],
                 'avg_college_mark': _round(row['avg_college_mark']),
                 'avg_willingness_percent': _round(row['avg_willingness_percent']),
             }
         )
 
-    return Response({'count': len(results), 'results': results})
+    return {'count': len(results), 'results': results}
 
 
 
@@ -317,8 +329,6 @@ def risk_list(request):
 
     Returns a 'risk' list of students with based on stress + low mark criteria (configurable).
     '''
-    prefix = _metrics_prefix()
-
     stress_level = request.query_params.get('stress_level') or 'Bad'
     max_mark = _parse_float(request.query_params.get('max_college_mark'))
 
@@ -327,51 +337,60 @@ def risk_list(request):
         max_mark = 60.0
 
     limit = _limit(request.query_params.get('limit'), default=20, max_value=200)
+    criteria = {'stress_level': stress_level, 'max_college_mark': max_mark, 'limit': limit}
 
+    return Response(cached_payload(params_key('risk_list', criteria), lambda: _risk_list_payload(criteria)))
+
+
+def _risk_list_payload(criteria: dict[str, Any]) -> dict[str, Any]:
     # Select suitable rows
     querySet = (
-        Student.objects.select_related('department', 'hobby')
-        .filter(**{f'{prefix}__stress_level': stress_level})
-        .filter(**{f'{prefix}__college_mark__lte': max_mark})
-        .order_by(F(f'{prefix}__college_mark').asc(nulls_last=True), 'pk')
+        Student.objects
+        .filter(
+            _stress_condition(criteria['stress_level']),
+            metrics__college_mark__lte=criteria['max_college_mark'],
+        )
+        .order_by(F(M_COLLEGE_MARK).asc(nulls_last=True), 'pk')
     )
 
+    # Metrics columns come back already named as in response
     rows = querySet.values(
-        'pk',
+        'id',
         'gender',
-        'department__name',
-        'hobby__name',
-        f'{prefix}__college_mark',
-        f'{prefix}__stress_level',
-        f'{prefix}__part_time_job',
-    )[:limit]
+        'department_name',
+        'hobby_name',
+        college_mark=F(M_COLLEGE_MARK),
+        stress_level=F(M_STRESS_LEVEL),
+        part_time_job=F(M_PART_TIME_JOB),
+    )[:criteria['limit']]
 
-    # Populate results
     results = []
+    # Only the names need renaming ('department'/'hobby' aliases clash with the FK fields), stress code -> label
     for row in rows:
-        results.append(
-            {
-                'id': row['pk'],
-                'gender': row['gender'],
-                'department': row['department__name'],
-                'hobby': row['hobby__name'],
-                'college_mark': row[f'{prefix}__college_mark'],
-                'stress_level': row[f'{prefix}__stress_level'],
-                'part_time_job': row[f'{prefix}__part_time_job'],
-            }
-        )
+        row['department'] = row.pop('department_name')
+        row['hobby'] = row.pop('hobby_name')
+        # Student w/o metrics row -> null
+        row['stress_level'] = STRESS_LABELS.get(row['stress_level'])
+        results.append(row)
 
-    return Response(
-        {
-            'criteria': {'stress_level': stress_level, 'max_college_mark': max_mark, 'limit': limit},
-            'count': len(results),
-            'results': results,
-        }
-    )
+    return {
+        'criteria': criteria,
+        'count': len(results),
+        'results': results,
+    }
 
 
 
 # === ADV.ROUTE 6: Analyze students BMI distribution ===
+# BMI categories, in threshold order
+BMI_BUCKETS = ('underweight', 'normal', 'overweight', 'obese')
+
+# Allowed `by` values -> field to group on
+BMI_GROUP_FIELDS = {
+    'gender': 'gender',
+    'department': 'department_name',
+}
+
 @api_view(['GET'])
 def bmi_distribution(request):
     '''
@@ -388,75 +407,79 @@ def bmi_distribution(request):
     # Grouping param (optional)
     by = (request.query_params.get('by') or '').strip().lower()
 
-    # Convert height to meters inside DB expression:
-    height_m = Cast(F('height_cm'), FloatField()) / Value(100.0)
-    # Calculate BMI [BMI = weight_kg / (height_m^2)]
-    bmi_expr = Cast(F('weight_kg'), FloatField()) / (height_m * height_m)
-
-    # Select suitable rows
-    querySet = Student.objects.annotate(bmi=bmi_expr)
-
     # Invalid grouping param (only allow gender/department aggregation)
-    if by not in ('', 'gender', 'department'):
+    if by and by not in BMI_GROUP_FIELDS:
         return Response(
             {'detail': 'Invalid `by`. Use `gender` or `department`.'},
             status=status.HTTP_400_BAD_REQUEST,
         )
 
-    # Group up
-    group_fields: list[str] = []
+    return Response(cached_payload(f'bmi_distribution:{by}', lambda: _bmi_distribution_payload(by)))
 
-    if by == 'gender':
-        group_fields = ['gender']
 
-    elif by == 'department':
-        group_fields = ['department__name']
+def _bmi_distribution_payload(by: str) -> dict[str, Any]:
+    # Assign each student a single bucket index (position in BMI_BUCKETS), integer compares on precomputed BMI x100
+    bucket_expr = Case(
+        When(bmi_x100__lt=1850, then=Value(0)),
+        When(bmi_x100__lt=2500, then=Value(1)),
+        When(bmi_x100__lt=3000, then=Value(2)),
+        default=Value(3),
+        output_field=IntegerField(),
+    )
+
+    querySet = Student.objects.annotate(bucket=bucket_expr)
+    groups: dict[Any, dict[str, Any]] = {}
 
-    # Create a copy of grouped fields
-    values_fields = group_fields[:]
-    # Select suitable rows and aggregate by BMI category (with/or without grouping)
-    querySet2 = (
-        querySet.values(*values_fields).annotate(
+    # No grouping -> single aggregate row, bucket counts as filtered counts
+    if not by:
+        totals = querySet.aggregate(
             total=Count('pk'),
-            underweight=Count('pk', filter=Q(bmi__lt=18.5)),
-            normal=Count('pk', filter=Q(bmi__gte=18.5, bmi__lt=25.0)),
-            overweight=Count('pk', filter=Q(bmi__gte=25.0, bmi__lt=30.0)),
-            obese=Count('pk', filter=Q(bmi__gte=30.0)),
-            avg_bmi=Avg('bmi'),
-        ).order_by(*values_fields) if values_fields 
-
-        else 
-            querySet.values().annotate(
-                total=Count('pk'),
-                underweight=Count('pk', filter=Q(bmi__lt=18.5)),
-                normal=Count('pk', filter=Q(bmi__gte=18.5, bmi__lt=25.0)),
-                overweight=Count('pk', filter=Q(bmi__gte=25.0, bmi__lt=30.0)),
-                obese=Count('pk', filter=Q(bmi__gte=30.0)),
-                avg_bmi=Avg('bmi'),
-            )
+            sum_bmi=Sum('bmi_x100'),
+            **{name: Count('pk', filter=Q(bucket=ind)) for ind, name in enumerate(BMI_BUCKETS)},
+        )
+
+        if totals['total']:
+            groups[None] = {
+                'total': totals['total'],
+                'sum_bmi': totals['sum_bmi'] or 0,
+                'buckets': {name: totals[name] for name in BMI_BUCKETS},
+            }
+
+        return _bmi_distribution_result(by, groups)
+
+    group_field = BMI_GROUP_FIELDS[by]
+
+    # One row per (group, bucket)
+    rows = (
+        querySet.values(group_field, 'bucket')
+        .annotate(total=Count('pk'), sum_bmi=Sum('bmi_x100'))
+        .order_by(group_field)
     )
 
+    # Pivot buckets into one entry per group
+    for row in rows:
+        group = groups.setdefault(
+            row[group_field],
+            {'total': 0, 'sum_bmi': 0.0, 'buckets': dict.fromkeys(BMI_BUCKETS, 0)},
+        )
+        group['total'] += row['total']
+        group['sum_bmi'] += row['sum_bmi'] or 0
+        group['buckets'][BMI_BUCKETS[row['bucket']]] = row['total']
+
+    return _bmi_distribution_result(by, groups)
+
+
+def _bmi_distribution_result(by: str, groups: dict[Any, dict[str, Any]]) -> dict[str, Any]:
     # Populate result
     results = []
-    for row in querySet2:
-        group: dict[str, Any] = {}
-        if by == 'gender':
-            group = {'gender': row.get('gender')}
-        elif by == 'department':
-            group = {'department': row.get('department__name')}
-
+    for group_value, group in groups.items():
         results.append(
             {
-                **group,
-                'total': row['total'],
-                'avg_bmi': _round(row['avg_bmi']),
-                'buckets': {
-                    'underweight': row['underweight'],
-                    'normal': row['normal'],
-                    'overweight': row['overweight'],
-                    'obese': row['obese'],
-                },
+                **({by: group_value} if by else {}),
+                'total': group['total'],
+                'avg_bmi': _round(group['sum_bmi'] / group['total'] / 100),
+                'buckets': group['buckets'],
             }
         )
 
-    return Response({'group_by': by or None, 'count': len(results), 'results': results})
\ No newline at end of file
+    return {'group_by': by or None, 'count': len(results), 'results': results}
@@ -3,3 +3,13 @@ from django.apps import AppConfig
 
 class StudentsAppConfig(AppConfig):
     name = 'students_app'
+
+    def ready(self):
+        # Register signal receivers (cache invalidation)
+        from students_app import signals  # noqa: F401
+        # Deploy checks (shared cache for the data version)
+        from students_app import checks  # noqa: F401
+
+        # Model introspection for serializer fields once at startup (inherited by forked test workers)
+        from students_app.serializers import CachedFieldsModelSerializer
+        CachedFieldsModelSerializer.warm_fields_cache()
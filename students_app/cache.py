@@ -0,0 +1,72 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from typing import Any, Callable
+import hashlib
+import json
+
+# Version stamp of the students data. Every write bumps it, so old cached payloads are never read again
+DATA_VERSION_KEY = 'students_version'
+
+
+def data_version() -> int:
+    '''
+    Current version of the students data (0 until the first write)
+    '''
+    return cache.get(DATA_VERSION_KEY, 0)
+
+
+def bump_data_version() -> None:
+    '''
+    Invalidate all cached analytics by moving to the next data version
+    '''
+    # incr() is atomic, but fails on a missing key, so seed it first
+    cache.add(DATA_VERSION_KEY, 0, timeout=None)
+
+    try:
+        cache.incr(DATA_VERSION_KEY)
+    except ValueError:
+        # Key was evicted between add() and incr()
+        cache.set(DATA_VERSION_KEY, 1, timeout=None)
+
+
+def bump_data_version_on_commit() -> None:
+    '''
+    Bump the data version once the current transaction commits (right away outside a transaction).
+    Bumping earlier lets a concurrent read cache pre-commit data under the new version
+    '''
+    transaction.on_commit(bump_data_version)
+
+
+def params_key(name: str, params: dict[str, Any]) -> str:
+    '''
+    Cache name for a payload that depends on (parsed) request params, params are hashed into a fixed size key
+    '''
+    digest = hashlib.sha1(json.dumps(params, sort_keys=True, default=str).encode()).hexdigest()
+
+    return f'{name}:{digest}'
+
+
+def data_version_etag(request, *args, **kwargs) -> str:
+    '''
+    ETag for read endpoints over the students data: same data version + same URL + same Accept -> same payload.
+    No DB access, so a matching If-None-Match is answered with 304 before any query or serialization
+    '''
+    key = f'{data_version()}:{request.get_full_path()}:{request.META.get("HTTP_ACCEPT", "")}'
+
+    return hashlib.sha1(key.encode()).hexdigest()
+
+
+def cached_payload(name: str, build: Callable[[], Any]) -> Any:
+    '''
+    Return response payload cached for the current data version, build (and store) it on a miss
+    '''
+    key = f'{name}:v{data_version()}'
+    payload = cache.get(key)
+
+    if payload is None:
+        payload = build()
+        cache.set(key, payload, settings.ANALYTICS_CACHE_TIMEOUT)
+
+    return payload
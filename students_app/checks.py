@@ -0,0 +1,22 @@
+from django.conf import settings
+from django.core.checks import Tags, Warning, register
+
+# Per-process cache backends: a write in one worker doesn't reach the others
+PROCESS_LOCAL_CACHES = ('django.core.cache.backends.locmem.LocMemCache',)
+
+
+@register(Tags.caches, deploy=True)
+def shared_cache_check(app_configs, **kwargs):
+    '''
+    `manage.py check --deploy`: analytics caching and list ETags rely on a data version shared by all workers
+    '''
+    if settings.CACHES['default']['BACKEND'] not in PROCESS_LOCAL_CACHES:
+        return []
+
+    return [
+        Warning(
+            'Default cache is process-local, data version bumps are not seen by other workers.',
+            hint='Set REDIS_URL (or another shared cache) when running more than one worker process.',
+            id='students_app.W001',
+        )
+    ]
@@ -2,7 +2,11 @@ from django.db import models
 
 # Small helper to fix inconsistent naming in CSV data (trim+)
 def normalize_str(string: str) -> str:
-    return str(string).strip().casefold()
+    # CSV cells are already str, skip the extra str() copy for them
+    if not isinstance(string, str):
+        string = str(string)
+
+    return string.strip().casefold()
 
 # Define enumerated field options (db value/label)
 
@@ -39,10 +43,11 @@ DAILY_STUDY_TIME_MAP = {
 }
 
 # === STUDY PREFERENCES ===
-class StudyPreference(models.TextChoices):
-    MORNING = 'Morning', 'Morning'
-    NIGHT = 'Night', 'Night'
-    ANYTIME = 'Anytime', 'Anytime'
+# Stored as small int codes (API still speaks labels)
+class StudyPreference(models.IntegerChoices):
+    MORNING = 1, 'Morning'
+    NIGHT = 2, 'Night'
+    ANYTIME = 3, 'Anytime'
 
 STUDY_PREFERENCE_MAP = {
     normalize_str('Morning'): StudyPreference.MORNING,
@@ -89,11 +94,12 @@ TRAVELING_TIME_MAP = {
 }
 
 # === STRESS LEVEL ===
-class StressLevel(models.TextChoices):
-    GOOD = 'Good', 'Good'
-    FABULOUS = 'Fabulous', 'Fabulous'
-    BAD = 'Bad', 'Bad'
-    AWFUL = 'Awful', 'Awful'
+# Int codes follow the scale (Awful=1 ... Fabulous=4), so ranges work too
+class StressLevel(models.IntegerChoices):
+    GOOD = 3, 'Good'
+    FABULOUS = 4, 'Fabulous'
+    BAD = 2, 'Bad'
+    AWFUL = 1, 'Awful'
 
 STRESS_LEVEL_MAP = {
     normalize_str('Awful'): StressLevel.AWFUL,
@@ -103,11 +109,11 @@ STRESS_LEVEL_MAP = {
 }
 
 # === FINANCIAL STATUS ===
-class FinancialStatus(models.TextChoices):
-    AWFUL = 'Awful', 'Awful'
-    BAD = 'Bad', 'Bad'
-    GOOD = 'Good', 'Good'
-    FABULOUS = 'Fabulous', 'Fabulous'
+class FinancialStatus(models.IntegerChoices):
+    AWFUL = 1, 'Awful'
+    BAD = 2, 'Bad'
+    GOOD = 3, 'Good'
+    FABULOUS = 4, 'Fabulous'
 
 FINANCIAL_STATUS_MAP = {
     normalize_str('Awful'): FinancialStatus.AWFUL,
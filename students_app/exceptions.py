@@ -0,0 +1,24 @@
+from django.db import IntegrityError
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.views import exception_handler
+
+from students_app.models import RANGE_CONSTRAINTS
+
+
+def api_exception_handler(exc, context):
+    '''
+    DRF exception handler that also turns DB constraint violations into 400 responses
+    (value ranges are only checked by the DB, see models.range_constraint)
+    '''
+    if isinstance(exc, IntegrityError):
+        message = str(exc)
+
+        # Report range violations same way as field validation errors
+        for name, (field, error) in RANGE_CONSTRAINTS.items():
+            if name in message:
+                return Response({field: [error]}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response({'detail': 'Data violates a database constraint.'}, status=status.HTTP_400_BAD_REQUEST)
+
+    return exception_handler(exc, context)
@@ -1,11 +1,24 @@
 import csv
+from contextlib import contextmanager
+from functools import lru_cache
+from itertools import batched
+from multiprocessing import Pool, current_process
+from operator import itemgetter
 from pathlib import Path
 import re
+import shutil
+import sys
+import tempfile
 
+from typing import Any, Callable, Iterable, Iterator, TextIO
+
+import django
 from django.core.management.base import BaseCommand, CommandError
 from django.db import transaction
 
 from students_app.models import Department, Hobby, Student, StudentMetrics
+from students_app.cache import bump_data_version_on_commit
+from students_app.signals import delete_invalidation_paused
 from students_app.contstants import (
     normalize_str,
     GENDER_MAP,
@@ -17,13 +30,20 @@ from students_app.contstants import (
     TRAVELING_TIME_MAP,
 )
 
+# Whitespace runs are collapsed to a single space (compiled once, used for every cell)
+_WS_RE = re.compile(r'\s+')
+_ws_sub = _WS_RE.sub
+
 # === Helper parser functions ===
+TRUE_VALUES = frozenset(('yes', 'y', 'true', '1'))
+FALSE_VALUES = frozenset(('no', 'n', 'false', '0'))
+
 def parse_bool(value: str) -> bool:
     v = str(value).strip().casefold()
 
-    if v in {'yes', 'y', 'true', '1'}:
+    if v in TRUE_VALUES:
         return True
-    if v in {'no', 'n', 'false', '0'}:
+    if v in FALSE_VALUES:
         return False
 
     raise ValueError(f'Invalid boolean value: {value!r}')
@@ -41,7 +61,28 @@ def parse_percent(value: str) -> int:
     s = str(value).strip()
     s = s.replace('%', '').strip()
 
-    return int(float(s))
+    p = int(float(s))
+    if not (0 <= p <= 100):
+        raise ValueError(f'Unrealistic percent: {value!r} -> {p}')
+
+    return p
+
+def parse_mark(value: str) -> float:
+    '''
+    Validate mark range (the DB constraint would otherwise fail the whole batch)
+    '''
+    m = parse_float(value)
+    if not (0 <= m <= 100):
+        raise ValueError(f'Unrealistic mark: {value!r} -> {m}')
+
+    return m
+
+def parse_salary(value: str) -> int:
+    s = parse_int(value)
+    if not (0 <= s <= 10_000_000):
+        raise ValueError(f'Unrealistic salary_expectation: {value!r} -> {s}')
+
+    return s
 
 def parse_height_cm(value: str) -> int:
     '''
@@ -63,28 +104,43 @@ def parse_weight_kg(value: str) -> int:
 
     return w
 
+def collapse_whitespace(value: str) -> str:
+    '''
+    Collapse whitespace runs. The regex only runs when there is something to collapse:
+    double spaces, or any whitespace other than plain space (tabs, newlines, nbsp are all non-printable)
+    '''
+    if '  ' in value or not value.isprintable():
+        return _ws_sub(' ', value)
+
+    return value
+
+def column_parser(parse: Callable[[str], Any]) -> Callable[[str], Any]:
+    '''
+    Memoize a cell parser by raw value. Survey columns only have a few distinct values,
+    so each one is parsed once per load (failures are not cached and raise again)
+    '''
+    return lru_cache(maxsize=None)(parse)
+
 def normalize_header(header: str) -> str:
     '''
     Normalize CSV headers:
     '''
-    h = str(header).strip()
-    h = re.sub(r'\s+', ' ', h)
+    # Files are read as utf-8-sig, but piped input may still start with a BOM
+    h = collapse_whitespace(str(header).strip().lstrip('\ufeff'))
 
     return h.casefold()
 
 def normalize_cell(value: str) -> str:
     '''Normalize cell strings similarly'''
     v = '' if value is None else str(value)
-    v = v.strip()
-    v = re.sub(r'\s+', ' ', v)
+    v = collapse_whitespace(v.strip())
 
     return v
 
 def normalize_label(value: str) -> str:
     '''We keep Department/Hobby name original case'''
     v = '' if value is None else str(value)
-    v = v.strip()
-    v = re.sub(r'\s+', ' ', v)
+    v = collapse_whitespace(v.strip())
     return v
 
 # === CSV column names (with typos and all) ===
@@ -108,6 +164,156 @@ COL_STRESS = normalize_header('Stress Level')
 COL_FIN = normalize_header('Financial Status')
 COL_PARTTIME = normalize_header('part-time job')
 
+# All fields required (the order is the order in which row cells are unpacked)
+REQUIRED_COLUMNS = (
+    COL_CERT, COL_GENDER, COL_DEPT, COL_HEIGHT, COL_WEIGHT,
+    COL_MARK10, COL_MARK12, COL_COLLEGE, COL_HOBBY,
+    COL_STUDY_TIME, COL_PREF, COL_SALARY, COL_LIKE_DEGREE,
+    COL_WILL, COL_MEDIA, COL_TRAVEL, COL_STRESS, COL_FIN, COL_PARTTIME,
+)
+
+
+
+# Stdin is kept in memory up to this size, bigger input spills to a temp file
+STDIN_SPOOL_MAX_MEMORY = 16 * 1024 * 1024
+
+def spool_stdin() -> TextIO:
+    '''
+    Copy stdin into a seekable buffer, the loader reads its input twice (names first, then rows)
+    '''
+    spool = tempfile.SpooledTemporaryFile(max_size=STDIN_SPOOL_MAX_MEMORY, mode='w+', encoding='utf-8', newline='')
+    shutil.copyfileobj(sys.stdin, spool)
+
+    return spool
+
+@contextmanager
+def open_csv(source: Path | TextIO) -> Iterator[TextIO]:
+    '''
+    Open CSV source for one pass: files are (re)opened, already open (spooled) streams are rewound
+    '''
+    if isinstance(source, Path):
+        with source.open('r', encoding='utf-8-sig', newline='') as f:
+            yield f
+    else:
+        source.seek(0)
+        yield source
+
+def read_rows(source: Path | TextIO, width: int) -> Iterator[list[str]]:
+    '''
+    Stream data rows (header skipped). Blank lines are skipped and short rows padded (same as DictReader did)
+    '''
+    with open_csv(source) as f:
+        reader = csv.reader(f)
+        next(reader, None)
+
+        for row in reader:
+            if not row:
+                continue
+            if len(row) < width:
+                row += [''] * (width - len(row))
+            yield row
+
+def resolve_name_ids(model: type[Department] | type[Hobby], names: set[str], batch_size: int) -> dict[str, int]:
+    '''
+    Map Department/Hobby names to ids, creating the missing rows. Already known names cost a single SELECT,
+    new ones one bulk INSERT + a SELECT of just those (ignore_conflicts doesn't return PKs on every DB)
+    '''
+    # Only the id is needed for FKs, so values_list instead of in_bulk() full objects
+    ids = dict(model.objects.filter(name__in=names).values_list('name', 'id'))
+    missing = names - ids.keys()
+
+    if missing:
+        model.objects.bulk_create(
+            [model(name=name) for name in sorted(missing)],
+            ignore_conflicts=True,
+            batch_size=batch_size,
+        )
+        ids.update(model.objects.filter(name__in=missing).values_list('name', 'id'))
+
+    return ids
+
+
+def make_row_parser() -> Callable[[tuple], tuple[dict, dict]]:
+    '''
+    Build a row parser (cells in REQUIRED_COLUMNS order -> student fields, metrics fields)
+    with its own memoized column parsers
+    '''
+    to_label = column_parser(normalize_label)
+    to_gender = column_parser(lambda v: GENDER_MAP[normalize_str(v)])
+    to_bool = column_parser(parse_bool)
+    to_height = column_parser(parse_height_cm)
+    to_weight = column_parser(parse_weight_kg)
+    to_salary = column_parser(parse_salary)
+    to_percent = column_parser(parse_percent)
+    to_study_time = column_parser(lambda v: DAILY_STUDY_TIME_MAP[normalize_str(v)])
+    to_media_time = column_parser(lambda v: MEDIA_VIDEO_TIME_MAP[normalize_str(v)])
+    to_travel_time = column_parser(lambda v: TRAVELING_TIME_MAP[normalize_str(v)])
+    to_preference = column_parser(lambda v: STUDY_PREFERENCE_MAP[normalize_str(v)])
+    to_financial = column_parser(lambda v: FINANCIAL_STATUS_MAP[normalize_str(v)])
+    to_stress = column_parser(lambda v: STRESS_LEVEL_MAP[normalize_str(v)])
+
+    def parse_row(cells: tuple) -> tuple[dict, dict]:
+        (
+            cert, gender_raw, dept_raw, height, weight,
+            mark10, mark12, college, hobby_raw,
+            study_time, pref, salary, like_degree,
+            will, media, travel, stress, fin, parttime,
+        ) = cells
+
+        # Student fields (FK ids are resolved from the names by the caller)
+        student = {
+            'gender': to_gender(gender_raw),
+            'department_name': to_label(dept_raw),
+            'height_cm': to_height(height),
+            'weight_kg': to_weight(weight),
+            'hobby_name': to_label(hobby_raw),
+        }
+
+        # Parse & store everything needed for creating of student survey metrics
+        study_enum, study_min = to_study_time(study_time)
+        media_enum, media_min = to_media_time(media)
+        travel_enum, travel_min = to_travel_time(travel)
+
+        surv_metrics = {
+            'certification_course': to_bool(cert),
+            'mark_10th': parse_mark(mark10),
+            'mark_12th': parse_mark(mark12),
+            'college_mark': parse_mark(college),
+            'daily_studying_time': study_enum,
+            'study_minutes': study_min,
+            'prefer_to_study_in': to_preference(pref),
+            'salary_expectation': to_salary(salary),
+            'likes_degree': to_bool(like_degree),
+            'part_time_job': to_bool(parttime),
+            'financial_status': to_financial(fin),
+            'willingness_percent': to_percent(will),
+            'social_media_video': media_enum,
+            'social_minutes': media_min,
+            'travelling_time': travel_enum,
+            'travel_minutes': travel_min,
+            'stress_level': to_stress(stress),
+        }
+
+        return student, surv_metrics
+
+    return parse_row
+
+def parse_chunk(chunk: Iterable[tuple[int, tuple]]) -> tuple[list[tuple[dict, dict]], list[str]]:
+    '''
+    Parse (line number, cells) pairs. Plain dicts only, so it can run in a worker process
+    '''
+    parse_row = make_row_parser()
+    parsed: list[tuple[dict, dict]] = []
+    errors: list[str] = []
+
+    for ind, cells in chunk:
+        try:
+            parsed.append(parse_row(cells))
+        except Exception as exc:
+            errors.append(f'Line {ind}: {exc}')
+
+    return parsed, errors
+
 
 
 class Command(BaseCommand):
@@ -118,7 +324,7 @@ class Command(BaseCommand):
         parser.add_argument(
             'csv_path',
             type=str,
-            help='Path to CSV file (e.g. `data/Student Attitude and Behavior.csv`)',
+            help='Path to CSV file (e.g. `data/Student Attitude and Behavior.csv`), or `-` to read it from stdin',
         )
 
         parser.add_argument(
@@ -134,158 +340,123 @@ class Command(BaseCommand):
             help='Batch size for bulk_create operations (default: 500)',
         )
 
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=1,
+            help='Parse rows in this many worker processes (default: 1, no pool). Only pays off for big files',
+        )
+
     @transaction.atomic
     def handle(self, *args, **options):
+        # Piped input (e.g. `gunzip -c data.csv.gz | manage.py load_students -`)
+        if options['csv_path'] == '-':
+            with spool_stdin() as spool:
+                self.load(spool, '<stdin>', options)
+            return
+
         csv_path = Path(options['csv_path']).expanduser().resolve()
-        truncate = bool(options['truncate'])
-        batch_size = int(options['batch_size'])
 
         if not csv_path.exists() or not csv_path.is_file():
             raise CommandError(f'CSV file not found: {csv_path}!')
 
+        self.load(csv_path, str(csv_path), options)
+
+    def load(self, source: Path | TextIO, source_name: str, options: dict[str, Any]) -> None:
+        '''
+        Load students from CSV source (file path or seekable stream)
+        '''
+        truncate = bool(options['truncate'])
+        batch_size = int(options['batch_size'])
+        workers = int(options['workers'])
+
         # If truncate option present: clear tables for deterministic re-runs
         if truncate:
-            # Delete in dependency order
-            StudentMetrics.objects.all().delete()
-            Student.objects.all().delete()
-            Department.objects.all().delete()
-            Hobby.objects.all().delete()
+            # Delete in dependency order. W/o per-row signals these are plain bulk DELETEs
+            with delete_invalidation_paused():
+                StudentMetrics.objects.all().delete()
+                Student.objects.all().delete()
+                Department.objects.all().delete()
+                Hobby.objects.all().delete()
+            # One bump right away (runs on commit, so it covers the load below too), every return path is invalidated
+            bump_data_version_on_commit()
             # Log it
             self.stdout.write(self.style.WARNING('Cleared existing data.'))
 
-        with csv_path.open('r', encoding='utf-8-sig', newline='') as f:
-            reader = csv.DictReader(f)
-            fieldnames = reader.fieldnames or []
-            # Normalize headers
-            normalized_fnames = {normalize_header(header) for header in fieldnames}
-            # All fields required
-            required = [
-                COL_CERT, COL_GENDER, COL_DEPT, COL_HEIGHT, COL_WEIGHT,
-                COL_MARK10, COL_MARK12, COL_COLLEGE, COL_HOBBY,
-                COL_STUDY_TIME, COL_PREF, COL_SALARY, COL_LIKE_DEGREE,
-                COL_WILL, COL_MEDIA, COL_TRAVEL, COL_STRESS, COL_FIN, COL_PARTTIME
-            ]
+        with open_csv(source) as f:
+            reader = csv.reader(f)
+            # Only the header is read here. Normalize it once, cells are then addressed by column position
+            normalized_fnames = [normalize_header(header) for header in next(reader, [])]
             # Check missing columns
-            missing = [col for col in required if col not in normalized_fnames]
+            missing = [col for col in REQUIRED_COLUMNS if col not in normalized_fnames]
 
             if missing:
                 raise CommandError(f'CSV missing required columns: {missing}')
 
-            rows = [
-                {normalize_header(k): v for k, v in raw.items()}
-                for raw in reader
-            ]
+        width = len(normalized_fnames)
 
-        # Guard clause for empty
-        if not rows:
-            self.stdout.write(self.style.WARNING('CSV is empty. Nothing to load.'))
-            return
+        # Picks required cells from a row in REQUIRED_COLUMNS order with a single call
+        pick_columns = itemgetter(*(normalized_fnames.index(col) for col in REQUIRED_COLUMNS))
+        dept_idx = normalized_fnames.index(COL_DEPT)
+        hobby_idx = normalized_fnames.index(COL_HOBBY)
 
-        # Ensure Departments & Hobbies exist
-        dept_names = sorted({normalize_label(row[COL_DEPT]) for row in rows})
-        hobby_names = sorted({normalize_label(row[COL_HOBBY]) for row in rows})
+        # First pass: only collect Department & Hobby names (the file is streamed, never held in memory)
+        dept_set: set[str] = set()
+        hobby_set: set[str] = set()
+        rows_read = 0
 
-        # Bulk create departments and Hobbies
-        Department.objects.bulk_create(
-            [Department(name=name) for name in dept_names],
-            ignore_conflicts=True,
-            batch_size=batch_size,
-        )
+        for row in read_rows(source, width):
+            dept_set.add(normalize_label(row[dept_idx]))
+            hobby_set.add(normalize_label(row[hobby_idx]))
+            rows_read += 1
 
-        Hobby.objects.bulk_create(
-            [Hobby(name=name) for name in hobby_names],
-            ignore_conflicts=True,
-            batch_size=batch_size,
-        )
+        # Guard clause for empty
+        if not rows_read:
+            self.stdout.write(self.style.WARNING('CSV is empty. Nothing to load.'))
+            return
 
+        # Ensure Departments & Hobbies exist, as a name -> id dict 'cache' (students only need the FK value)
+        dept_by_name = resolve_name_ids(Department, dept_set, batch_size)
+        hobby_by_name = resolve_name_ids(Hobby, hobby_set, batch_size)
 
-        # Create a dict 'cache'
-        dept_by_name = {department.name: department for department in Department.objects.filter(name__in=dept_names)}
-        hobby_by_name = {hobby.name: hobby for hobby in Hobby.objects.filter(name__in=hobby_names)}
+        # Second pass: pick required cells per row, numbered by CSV line (row 1 is header, so we start from 2).
+        # Chunks are parsed one at a time (or in parallel by the pool) and inserted as one batch each
+        chunks = batched(enumerate(map(pick_columns, read_rows(source, width)), start=2), batch_size)
 
-        # Build Students + keep parsed metric payloads aligned by index
-        students: list[Student] = []
-        metrics_payloads: list[dict] = []
         errors: list[str] = []
-
-        # Iterate and create students (populating list) and collecting metrics (row 1 is header, so we start from 2)
-        for ind, row in enumerate(rows, start=2):
-            try:
-                dept_name = normalize_label(row[COL_DEPT])
-                hobby_name = normalize_label(row[COL_HOBBY])
-                dept = dept_by_name[dept_name]
-                hobby = hobby_by_name[hobby_name]
-
-                gender = GENDER_MAP[normalize_str(row[COL_GENDER])]
-
-                # Create student
-                student = Student(
-                    gender=gender,
-                    department=dept,
-                    height_cm=parse_height_cm(row[COL_HEIGHT]),
-                    weight_kg=parse_weight_kg(row[COL_WEIGHT]),
-                    hobby=hobby,
-                )
-                students.append(student)
-
-                # Parse & store everything needed for creating of student survey metrics
-                study_enum, study_min = DAILY_STUDY_TIME_MAP[normalize_str(row[COL_STUDY_TIME])]
-                media_enum, media_min = MEDIA_VIDEO_TIME_MAP[normalize_str(row[COL_MEDIA])]
-                travel_enum, travel_min = TRAVELING_TIME_MAP[normalize_str(row[COL_TRAVEL])]
-
-                surv_metrics = {
-                    'certification_course': parse_bool(row[COL_CERT]),
-                    'mark_10th': parse_float(row[COL_MARK10]),
-                    'mark_12th': parse_float(row[COL_MARK12]),
-                    'college_mark': parse_float(row[COL_COLLEGE]),
-                    'daily_studying_time': study_enum,
-                    'study_minutes': study_min,
-                    'prefer_to_study_in': STUDY_PREFERENCE_MAP[normalize_str(row[COL_PREF])],
-                    'salary_expectation': parse_int(row[COL_SALARY]),
-                    'likes_degree': parse_bool(row[COL_LIKE_DEGREE]),
-                    'part_time_job': parse_bool(row[COL_PARTTIME]),
-                    'financial_status': FINANCIAL_STATUS_MAP[normalize_str(row[COL_FIN])],
-                    'willingness_percent': parse_percent(row[COL_WILL]),
-                    'social_media_video': media_enum,
-                    'social_minutes': media_min,
-                    'travelling_time': travel_enum,
-                    'travel_minutes': travel_min,
-                    'stress_level': STRESS_LEVEL_MAP[normalize_str(row[COL_STRESS])],
-                }
-                metrics_payloads.append(surv_metrics)
-
-            except Exception as exc:
-                errors.append(f'Line {ind}: {exc}')
-                continue
+        created_count = 0
+
+        # Daemonic processes (e.g. `manage.py test --parallel` workers) can't start a pool, parse in process then
+        if workers > 1 and current_process().daemon:
+            self.stdout.write(self.style.WARNING('Running in a daemonic process, --workers ignored.'))
+            workers = 1
+
+        if workers > 1:
+            # Workers (re)initialize Django, so this works with spawn start method too
+            with Pool(workers, initializer=django.setup) as pool:
+                for parsed, chunk_errors in pool.imap(parse_chunk, chunks):
+                    errors.extend(chunk_errors)
+                    created_count += self._insert_parsed(parsed, dept_by_name, hobby_by_name)
+        else:
+            for parsed, chunk_errors in map(parse_chunk, chunks):
+                errors.extend(chunk_errors)
+                created_count += self._insert_parsed(parsed, dept_by_name, hobby_by_name)
 
         # Guard clause
-        if not students:
+        if not created_count:
             raise CommandError(f'All rows failed to parse. First errors: {errors[:5]}')
 
-        # DB Bulk create students
-        created_students = Student.objects.bulk_create(students, batch_size=batch_size)
-
-        # Guard clause - failed student creatin
-        if any(student.pk is None for student in created_students):
-            raise CommandError(
-                'bulk_create did not populate Student table (no PKs), can`t proceed with metrics creation!'
-            )
-
-        # Student metrics creation
-        metrics: list[StudentMetrics] = []
-        # We use zip trick to iterate over 2 iterables at the same time (pair iteration)
-        for student, payload in zip(created_students, metrics_payloads):
-            metrics.append(StudentMetrics(student=student, **payload))
-
-        # Bulk create metrics
-        StudentMetrics.objects.bulk_create(metrics, batch_size=batch_size)
+        # bulk_create doesn't send post_save signals, so invalidate cached analytics manually (after the commit).
+        # Already queued by --truncate
+        if not truncate:
+            bump_data_version_on_commit()
 
         # Log to console
         self.stdout.write(self.style.SUCCESS('Bulk CSV load finished.'))
-        self.stdout.write(f'File: {csv_path}')
-        self.stdout.write(f'Rows read: {len(rows)}')
-        self.stdout.write(f'Students created: {len(created_students)}')
-        self.stdout.write(f'Metrics created: {len(metrics)}')
+        self.stdout.write(f'File: {source_name}')
+        self.stdout.write(f'Rows read: {rows_read}')
+        self.stdout.write(f'Students created: {created_count}')
+        self.stdout.write(f'Metrics created: {created_count}')
         self.stdout.write(f'Rows skipped (parse errors): {len(errors)}')
 
         # Log errors
@@ -294,4 +465,50 @@ class Command(BaseCommand):
             for msg in errors[:10]:
                 self.stdout.write(f'  - {msg}')
             if len(errors) > 10:
-                self.stdout.write(f'  ... and {len(errors) - 10} more.')
\ No newline at end of file
+                self.stdout.write(f'  ... and {len(errors) - 10} more.')
+
+    def _insert_parsed(
+        self,
+        parsed: list[tuple[dict, dict]],
+        dept_by_name: dict[str, int],
+        hobby_by_name: dict[str, int],
+    ) -> int:
+        '''
+        Build Students from parsed rows (resolving FK ids by name) and insert them with their metrics
+        '''
+        if not parsed:
+            return 0
+
+        # bulk_create skips save(), denormalized names come with the parsed fields
+        students = [
+            Student(
+                department_id=dept_by_name[fields['department_name']],
+                hobby_id=hobby_by_name[fields['hobby_name']],
+                **fields,
+            )
+            for fields, _ in parsed
+        ]
+
+        return self._insert_batch(students, [metrics for _, metrics in parsed])
+
+    def _insert_batch(self, students: list[Student], metrics_payloads: list[dict]) -> int:
+        '''
+        Bulk create one batch of students, then their metrics (metrics need student PKs)
+        '''
+        created_students = Student.objects.bulk_create(students)
+
+        # Guard clause - failed student creatin
+        if any(student.pk is None for student in created_students):
+            raise CommandError(
+                'bulk_create did not populate Student table (no PKs), can`t proceed with metrics creation!'
+            )
+
+        # We use zip trick to iterate over 2 iterables at the same time (pair iteration)
+        StudentMetrics.objects.bulk_create(
+            [
+                StudentMetrics(student_id=student.pk, **payload)
+                for student, payload in zip(created_students, metrics_payloads)
+            ]
+        )
+
+        return len(created_students)
@@ -0,0 +1,42 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Case, When, F, Value, PositiveSmallIntegerField
+
+from students_app.models import StudentMetrics
+from students_app.cache import bump_data_version_on_commit
+from students_app.serializers import DAILY_STUDY_MINUTES, MEDIA_VIDEO_MINUTES, TRAVELING_MINUTES
+
+# Minutes column -> (enum column it is derived from, enum value -> minutes map)
+MINUTES_FIELDS = {
+    'study_minutes': ('daily_studying_time', DAILY_STUDY_MINUTES),
+    'social_minutes': ('social_media_video', MEDIA_VIDEO_MINUTES),
+    'travel_minutes': ('travelling_time', TRAVELING_MINUTES),
+}
+
+def minutes_case(minutes_field: str, enum_field: str, minutes_map: dict[str, int]) -> Case:
+    '''
+    SQL CASE that maps enum column values to minutes (unknown values keep the current minutes)
+    '''
+    return Case(
+        *(When(**{enum_field: enum_value}, then=Value(minutes)) for enum_value, minutes in minutes_map.items()),
+        default=F(minutes_field),
+        output_field=PositiveSmallIntegerField(),
+    )
+
+
+
+class Command(BaseCommand):
+    help = 'Recompute StudentMetrics minutes columns from their enum columns in a single UPDATE.'
+
+    def handle(self, *args, **options):
+        # All three columns in one statement, so the table is scanned once and no rows go through Python
+        updated = StudentMetrics.objects.update(
+            **{
+                minutes_field: minutes_case(minutes_field, enum_field, minutes_map)
+                for minutes_field, (enum_field, minutes_map) in MINUTES_FIELDS.items()
+            }
+        )
+
+        # update() doesn't send post_save signals, so invalidate cached analytics manually
+        bump_data_version_on_commit()
+
+        self.stdout.write(self.style.SUCCESS(f'Recomputed minutes for {updated} metrics rows.'))
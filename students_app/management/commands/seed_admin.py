@@ -1,5 +1,6 @@
 from django.core.management.base import BaseCommand, CommandError
 from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import identify_hasher, make_password
 from django.conf import settings
 
 from typing import cast
@@ -12,6 +13,17 @@ def require_setting(name: str) -> str:
 
     return value
 
+def is_password_hash(value: str) -> bool:
+    '''
+    True if value is already an encoded hash of one of the configured PASSWORD_HASHERS
+    '''
+    try:
+        identify_hasher(value)
+    except ValueError:
+        return False
+
+    return True
+
 
 
 class Command(BaseCommand):
@@ -25,11 +37,21 @@ class Command(BaseCommand):
         password = require_setting('ADMIN_PASSWORD')
         email = require_setting('ADMIN_EMAIL')
 
-        # Guard clause
-        if User.objects.filter(username=username).exists():
+        # Password is hashed lazily (callable default), so the 'already exists' path is a single SELECT.
+        # If env already holds a hash (e.g. from `make_password`), it's stored as is
+        user, created = User.objects.get_or_create(
+            username=username,
+            defaults={
+                'email': User.objects.normalize_email(email),
+                'password': lambda: password if is_password_hash(password) else make_password(password),
+                'is_staff': True,
+                'is_superuser': True,
+            },
+        )
+
+        # Log
+        if not created:
             self.stdout.write(self.style.SUCCESS(f'Superuser `{username}` already exists.'))
             return
 
-        # Create super user, if needed, and log
-        User.objects.create_superuser(username=username, email=email, password=password)
-        self.stdout.write(self.style.SUCCESS(f'Created superuser `{username}` from env/settings.'))
\ No newline at end of file
+        self.stdout.write(self.style.SUCCESS(f'Created superuser `{user.get_username()}` from env/settings.'))
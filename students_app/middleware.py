@@ -0,0 +1,19 @@
+from django.urls import reverse
+
+from students_app.views import health
+
+
+class HealthCheckMiddleware:
+    '''
+    Answer the health probe before the rest of the middleware stack and URL resolution run.
+    Goes first in MIDDLEWARE, calls the `health` view directly (same body, ETag and allowed methods)
+    '''
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.path = reverse('health')
+
+    def __call__(self, request):
+        if request.path == self.path:
+            return health(request)
+
+        return self.get_response(request)
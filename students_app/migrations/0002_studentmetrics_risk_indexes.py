@@ -0,0 +1,21 @@
+# Generated by Django 6.0 on 2026-10-15 22:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('students_app', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='studentmetrics',
+            index=models.Index(fields=['stress_level', 'college_mark'], name='sm_stress_mark_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='studentmetrics',
+            index=models.Index(condition=models.Q(('stress_level__in', ['Bad', 'Awful'])), fields=['college_mark'], name='sm_risk_idx'),
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 6.0 on 2026-10-15 22:09
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def backfill_names(apps, schema_editor):
+    Student = apps.get_model('students_app', 'Student')
+    Department = apps.get_model('students_app', 'Department')
+    Hobby = apps.get_model('students_app', 'Hobby')
+
+    Student.objects.update(
+        department_name=Subquery(Department.objects.filter(pk=OuterRef('department_id')).values('name')[:1]),
+        hobby_name=Subquery(Hobby.objects.filter(pk=OuterRef('hobby_id')).values('name')[:1]),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('students_app', '0002_studentmetrics_risk_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='student',
+            name='department_name',
+            field=models.CharField(blank=True, default='', editable=False, max_length=100),
+        ),
+        migrations.AddField(
+            model_name='student',
+            name='hobby_name',
+            field=models.CharField(blank=True, default='', editable=False, max_length=100),
+        ),
+        migrations.RunPython(backfill_names, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 6.0 on 2026-10-15 22:13
+
+from django.db import migrations, models
+from django.db.models.functions import Cast
+
+
+def backfill_bmi(apps, schema_editor):
+    Student = apps.get_model('students_app', 'Student')
+    # Integer division in DB floors, same as calc_bmi_x100().
+    # Operands cast to int: smallint * smallint stays smallint on PostgreSQL and overflows from 182 cm
+    height = Cast('height_cm', models.IntegerField())
+    Student.objects.update(bmi_x100=Cast('weight_kg', models.IntegerField()) * 1_000_000 / (height * height))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('students_app', '0003_student_denormalized_names'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='student',
+            name='bmi_x100',
+            field=models.PositiveIntegerField(db_index=True, default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_bmi, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 6.0 on 2026-10-15 22:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('students_app', '0004_student_bmi_x100'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='studentmetrics',
+            name='stress_level',
+            field=models.CharField(choices=[('Good', 'Good'), ('Fabulous', 'Fabulous'), ('Bad', 'Bad'), ('Awful', 'Awful')], max_length=20),
+        ),
+        migrations.AddIndex(
+            model_name='student',
+            index=models.Index(fields=['department', 'gender'], name='student_dept_gender_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='studentmetrics',
+            index=models.Index(fields=['part_time_job', 'college_mark'], name='sm_parttime_mark_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='studentmetrics',
+            index=models.Index(fields=['daily_studying_time', 'college_mark'], name='sm_studytime_mark_idx'),
+        ),
+    ]
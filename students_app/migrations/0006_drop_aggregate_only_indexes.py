@@ -0,0 +1,59 @@
+# Generated by Django 6.0 on 2026-10-15 22:16
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('students_app', '0005_composite_analytics_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='student',
+            name='height_cm',
+            field=models.PositiveSmallIntegerField(validators=[django.core.validators.MinValueValidator(50), django.core.validators.MaxValueValidator(250)]),
+        ),
+        migrations.AlterField(
+            model_name='student',
+            name='weight_kg',
+            field=models.PositiveSmallIntegerField(validators=[django.core.validators.MinValueValidator(20), django.core.validators.MaxValueValidator(300)]),
+        ),
+        migrations.AlterField(
+            model_name='studentmetrics',
+            name='mark_10th',
+            field=models.FloatField(validators=[django.core.validators.MinValueValidator(0), django.core.validators.MaxValueValidator(100)]),
+        ),
+        migrations.AlterField(
+            model_name='studentmetrics',
+            name='mark_12th',
+            field=models.FloatField(validators=[django.core.validators.MinValueValidator(0), django.core.validators.MaxValueValidator(100)]),
+        ),
+        migrations.AlterField(
+            model_name='studentmetrics',
+            name='salary_expectation',
+            field=models.PositiveIntegerField(validators=[django.core.validators.MinValueValidator(0), django.core.validators.MaxValueValidator(10000000)]),
+        ),
+        migrations.AlterField(
+            model_name='studentmetrics',
+            name='social_minutes',
+            field=models.PositiveSmallIntegerField(validators=[django.core.validators.MinValueValidator(0), django.core.validators.MaxValueValidator(1440)]),
+        ),
+        migrations.AlterField(
+            model_name='studentmetrics',
+            name='study_minutes',
+            field=models.PositiveSmallIntegerField(validators=[django.core.validators.MinValueValidator(0), django.core.validators.MaxValueValidator(1440)]),
+        ),
+        migrations.AlterField(
+            model_name='studentmetrics',
+            name='travel_minutes',
+            field=models.PositiveSmallIntegerField(validators=[django.core.validators.MinValueValidator(0), django.core.validators.MaxValueValidator(1440)]),
+        ),
+        migrations.AlterField(
+            model_name='studentmetrics',
+            name='willingness_percent',
+            field=models.PositiveSmallIntegerField(validators=[django.core.validators.MinValueValidator(0), django.core.validators.MaxValueValidator(100)]),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 6.0 on 2026-10-15 22:17
+
+import django.db.models.expressions
+import django.db.models.functions.comparison
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('students_app', '0006_drop_aggregate_only_indexes'),
+    ]
+
+    # Plain column -> generated column can't be altered in place, so it's dropped and re-added
+    # (the DB fills the values for existing rows). Operands are cast to int so PostgreSQL doesn't
+    # multiply in smallint (overflows for height >= 182)
+    operations = [
+        migrations.RemoveField(
+            model_name='student',
+            name='bmi_x100',
+        ),
+        migrations.AddField(
+            model_name='student',
+            name='bmi_x100',
+            field=models.GeneratedField(db_index=True, db_persist=True, expression=django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.functions.comparison.Cast('weight_kg', models.IntegerField()), '*', models.Value(1000000)), '/', django.db.models.expressions.CombinedExpression(django.db.models.functions.comparison.Cast('height_cm', models.IntegerField()), '*', django.db.models.functions.comparison.Cast('height_cm', models.IntegerField()))), output_field=models.PositiveIntegerField()),
+        ),
+    ]
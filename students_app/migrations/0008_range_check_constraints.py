@@ -0,0 +1,103 @@
+# Generated by Django 6.0 on 2026-10-15 22:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('students_app', '0007_student_bmi_x100_generated'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='student',
+            name='height_cm',
+            field=models.PositiveSmallIntegerField(),
+        ),
+        migrations.AlterField(
+            model_name='student',
+            name='weight_kg',
+            field=models.PositiveSmallIntegerField(),
+        ),
+        migrations.AlterField(
+            model_name='studentmetrics',
+            name='college_mark',
+            field=models.FloatField(db_index=True),
+        ),
+        migrations.AlterField(
+            model_name='studentmetrics',
+            name='mark_10th',
+            field=models.FloatField(),
+        ),
+        migrations.AlterField(
+            model_name='studentmetrics',
+            name='mark_12th',
+            field=models.FloatField(),
+        ),
+        migrations.AlterField(
+            model_name='studentmetrics',
+            name='salary_expectation',
+            field=models.PositiveIntegerField(),
+        ),
+        migrations.AlterField(
+            model_name='studentmetrics',
+            name='social_minutes',
+            field=models.PositiveSmallIntegerField(),
+        ),
+        migrations.AlterField(
+            model_name='studentmetrics',
+            name='study_minutes',
+            field=models.PositiveSmallIntegerField(),
+        ),
+        migrations.AlterField(
+            model_name='studentmetrics',
+            name='travel_minutes',
+            field=models.PositiveSmallIntegerField(),
+        ),
+        migrations.AlterField(
+            model_name='studentmetrics',
+            name='willingness_percent',
+            field=models.PositiveSmallIntegerField(),
+        ),
+        migrations.AddConstraint(
+            model_name='student',
+            constraint=models.CheckConstraint(condition=models.Q(('height_cm__gte', 50), ('height_cm__lte', 250)), name='student_height_cm_range', violation_error_message='Ensure this value is between 50 and 250.'),
+        ),
+        migrations.AddConstraint(
+            model_name='student',
+            constraint=models.CheckConstraint(condition=models.Q(('weight_kg__gte', 20), ('weight_kg__lte', 300)), name='student_weight_kg_range', violation_error_message='Ensure this value is between 20 and 300.'),
+        ),
+        migrations.AddConstraint(
+            model_name='studentmetrics',
+            constraint=models.CheckConstraint(condition=models.Q(('mark_10th__gte', 0), ('mark_10th__lte', 100)), name='sm_mark_10th_range', violation_error_message='Ensure this value is between 0 and 100.'),
+        ),
+        migrations.AddConstraint(
+            model_name='studentmetrics',
+            constraint=models.CheckConstraint(condition=models.Q(('mark_12th__gte', 0), ('mark_12th__lte', 100)), name='sm_mark_12th_range', violation_error_message='Ensure this value is between 0 and 100.'),
+        ),
+        migrations.AddConstraint(
+            model_name='studentmetrics',
+            constraint=models.CheckConstraint(condition=models.Q(('college_mark__gte', 0), ('college_mark__lte', 100)), name='sm_college_mark_range', violation_error_message='Ensure this value is between 0 and 100.'),
+        ),
+        migrations.AddConstraint(
+            model_name='studentmetrics',
+            constraint=models.CheckConstraint(condition=models.Q(('salary_expectation__gte', 0), ('salary_expectation__lte', 10000000)), name='sm_salary_expectation_range', violation_error_message='Ensure this value is between 0 and 10000000.'),
+        ),
+        migrations.AddConstraint(
+            model_name='studentmetrics',
+            constraint=models.CheckConstraint(condition=models.Q(('willingness_percent__gte', 0), ('willingness_percent__lte', 100)), name='sm_willingness_percent_range', violation_error_message='Ensure this value is between 0 and 100.'),
+        ),
+        migrations.AddConstraint(
+            model_name='studentmetrics',
+            constraint=models.CheckConstraint(condition=models.Q(('study_minutes__gte', 0), ('study_minutes__lte', 1440)), name='sm_study_minutes_range', violation_error_message='Ensure this value is between 0 and 1440.'),
+        ),
+        migrations.AddConstraint(
+            model_name='studentmetrics',
+            constraint=models.CheckConstraint(condition=models.Q(('social_minutes__gte', 0), ('social_minutes__lte', 1440)), name='sm_social_minutes_range', violation_error_message='Ensure this value is between 0 and 1440.'),
+        ),
+        migrations.AddConstraint(
+            model_name='studentmetrics',
+            constraint=models.CheckConstraint(condition=models.Q(('travel_minutes__gte', 0), ('travel_minutes__lte', 1440)), name='sm_travel_minutes_range', violation_error_message='Ensure this value is between 0 and 1440.'),
+        ),
+    ]
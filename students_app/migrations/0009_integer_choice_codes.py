@@ -0,0 +1,64 @@
+# Generated by Django 6.0 on 2026-10-15 22:24
+
+from django.db import migrations, models
+
+
+# Old text values -> new int codes (frozen here, so later enum changes don't alter this migration)
+CODES = {
+    'stress_level': {'Awful': 1, 'Bad': 2, 'Good': 3, 'Fabulous': 4},
+    'financial_status': {'Awful': 1, 'Bad': 2, 'Good': 3, 'Fabulous': 4},
+    'prefer_to_study_in': {'Morning': 1, 'Night': 2, 'Anytime': 3},
+}
+
+
+def _recode(apps, field, mapping):
+    StudentMetrics = apps.get_model('students_app', 'StudentMetrics')
+
+    for old, new in mapping.items():
+        StudentMetrics.objects.filter(**{field: old}).update(**{field: new})
+
+
+def text_to_codes(apps, schema_editor):
+    # Columns are still text here, store the codes as digit strings, AlterField casts them
+    for field, codes in CODES.items():
+        _recode(apps, field, {label: str(code) for label, code in codes.items()})
+
+
+def codes_to_text(apps, schema_editor):
+    # Runs after the columns were altered back to text
+    for field, codes in CODES.items():
+        _recode(apps, field, {str(code): label for label, code in codes.items()})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('students_app', '0008_range_check_constraints'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='studentmetrics',
+            name='sm_risk_idx',
+        ),
+        migrations.RunPython(text_to_codes, codes_to_text),
+        migrations.AlterField(
+            model_name='studentmetrics',
+            name='financial_status',
+            field=models.PositiveSmallIntegerField(choices=[(1, 'Awful'), (2, 'Bad'), (3, 'Good'), (4, 'Fabulous')], db_index=True),
+        ),
+        migrations.AlterField(
+            model_name='studentmetrics',
+            name='prefer_to_study_in',
+            field=models.PositiveSmallIntegerField(choices=[(1, 'Morning'), (2, 'Night'), (3, 'Anytime')]),
+        ),
+        migrations.AlterField(
+            model_name='studentmetrics',
+            name='stress_level',
+            field=models.PositiveSmallIntegerField(choices=[(3, 'Good'), (4, 'Fabulous'), (2, 'Bad'), (1, 'Awful')]),
+        ),
+        migrations.AddIndex(
+            model_name='studentmetrics',
+            index=models.Index(condition=models.Q(('stress_level__in', [2, 1])), fields=['college_mark'], name='sm_risk_idx'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 6.0 on 2026-10-15 22:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('students_app', '0009_integer_choice_codes'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='student',
+            name='student_dept_gender_idx',
+        ),
+        migrations.AddIndex(
+            model_name='student',
+            index=models.Index(fields=['department', 'gender', 'id'], name='student_dept_gender_id_idx'),
+        ),
+    ]
@@ -1,5 +1,6 @@
 from django.db import models
-from django.core.validators import MinValueValidator, MaxValueValidator
+from django.db.models import Q
+from django.db.models.functions import Cast
 from students_app.contstants import (
     Gender, 
     DailyStudyTime, 
@@ -12,6 +13,24 @@ from students_app.contstants import (
 
 # Create your models here.
 
+# Range checks live in the DB (CheckConstraint), constraint name -> (field, message) for API error responses
+RANGE_CONSTRAINTS: dict[str, tuple[str, str]] = {}
+
+def range_constraint(prefix: str, field: str, low: int, high: int) -> models.CheckConstraint:
+    '''
+    DB level `low <= field <= high` check (also validated by Model.full_clean(), e.g. in admin)
+    '''
+    name = f'{prefix}_{field}_range'
+    message = f'Ensure this value is between {low} and {high}.'
+    RANGE_CONSTRAINTS[name] = (field, message)
+
+    return models.CheckConstraint(
+        condition=Q(**{f'{field}__gte': low, f'{field}__lte': high}),
+        name=name,
+        violation_error_message=message,
+    )
+
+
 class Department(models.Model):
     name = models.CharField(max_length=100, unique=True)
 
@@ -47,15 +66,10 @@ class Student(models.Model):
         related_name='students', 
     )
 
-    height_cm = models.PositiveSmallIntegerField(
-        validators=[MinValueValidator(50), MaxValueValidator(250)],
-        db_index=True,
-    )
+    # Value ranges are checked by DB constraints (see Meta)
+    height_cm = models.PositiveSmallIntegerField()
 
-    weight_kg = models.PositiveSmallIntegerField(
-        validators=[MinValueValidator(20), MaxValueValidator(300)],
-        db_index=True,
-    )
+    weight_kg = models.PositiveSmallIntegerField()
 
     hobby = models.ForeignKey(
         Hobby, 
@@ -68,12 +82,64 @@ class Student(models.Model):
         db_index=True
     )
 
+    # Denormalized copies of the related names, so analytics can read them w/o joins.
+    # Set on save, kept in sync on Department/Hobby rename (see signals)
+    department_name = models.CharField(max_length=100, blank=True, default='', editable=False)
+    hobby_name = models.CharField(max_length=100, blank=True, default='', editable=False)
+
+    # BMI * 100 as int, stored generated column (DB keeps it in sync, incl. bulk inserts/updates).
+    # Integer division floors, so `bmi_x100 < 1850` is exactly `bmi < 18.5`.
+    # Operands cast to int: smallint * smallint stays smallint on PostgreSQL and overflows from 182 cm
+    bmi_x100 = models.GeneratedField(
+        expression=(
+            Cast('weight_kg', models.IntegerField()) * 1_000_000
+            / (Cast('height_cm', models.IntegerField()) * Cast('height_cm', models.IntegerField()))
+        ),
+        output_field=models.PositiveIntegerField(),
+        db_persist=True,
+        db_index=True,
+    )
+
     class Meta:
         ordering = ['id']
 
+        indexes = [
+            # Students search: department + gender filter combo, then `ORDER BY id LIMIT n` read in index order
+            # (no sort step, scan stops after n rows)
+            models.Index(fields=['department', 'gender', 'id'], name='student_dept_gender_id_idx'),
+        ]
+
+        constraints = [
+            range_constraint('student', 'height_cm', 50, 250),
+            range_constraint('student', 'weight_kg', 20, 300),
+        ]
+
     def __str__(self) -> str:
         return f'Student #{self.pk} ({self.department})'
 
+    # Relation -> denormalized name column filled from it
+    DERIVED_FIELDS = {'department': 'department_name', 'hobby': 'hobby_name'}
+
+    def set_derived_fields(self) -> None:
+        '''
+        Fill denormalized columns. Called by save(), bulk paths call it themselves
+        '''
+        self.department_name = self.department.name
+        self.hobby_name = self.hobby.name
+
+    def save(self, *args, **kwargs):
+        self.set_derived_fields()
+
+        # Partial save: a changed relation also writes its denormalized name
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            kwargs['update_fields'] = {
+                *update_fields,
+                *(name for relation, name in self.DERIVED_FIELDS.items() if relation in update_fields),
+            }
+
+        super().save(*args, **kwargs)
+
 
 class StudentMetrics(models.Model):
     '''
@@ -85,18 +151,12 @@ class StudentMetrics(models.Model):
 
     certification_course = models.BooleanField(default=False)
 
-    mark_10th = models.FloatField(
-        validators=[MinValueValidator(0), MaxValueValidator(100)],
-        db_index=True,
-    )
+    # Value ranges are checked by DB constraints (see Meta)
+    mark_10th = models.FloatField()
 
-    mark_12th = models.FloatField(
-        validators=[MinValueValidator(0), MaxValueValidator(100)],
-        db_index=True,
-    )
+    mark_12th = models.FloatField()
 
     college_mark = models.FloatField(
-        validators=[MinValueValidator(0), MaxValueValidator(100)],
         db_index=True
     )
 
@@ -105,22 +165,15 @@ class StudentMetrics(models.Model):
         choices=DailyStudyTime.choices,
     )
 
-    prefer_to_study_in = models.CharField(
-        max_length=10, 
+    prefer_to_study_in = models.PositiveSmallIntegerField(
         choices=StudyPreference.choices
     )
 
-    salary_expectation = models.PositiveIntegerField(
-        validators=[MinValueValidator(0), MaxValueValidator(10_000_000)],
-        db_index=True,
-    )
+    salary_expectation = models.PositiveIntegerField()
 
     likes_degree = models.BooleanField(default=False)
 
-    willingness_percent = models.PositiveSmallIntegerField(
-        validators=[MinValueValidator(0), MaxValueValidator(100)],
-        db_index=True
-    )
+    willingness_percent = models.PositiveSmallIntegerField()
 
     social_media_video = models.CharField(
         max_length=20, 
@@ -132,14 +185,12 @@ class StudentMetrics(models.Model):
         choices=TravelingTime.choices,
     )
 
-    stress_level = models.CharField(
-        max_length=20, 
+    # No single-column index, sm_stress_mark_idx (stress_level first) covers stress level lookups
+    stress_level = models.PositiveSmallIntegerField(
         choices=StressLevel.choices, 
-        db_index=True
     )
 
-    financial_status = models.CharField(
-        max_length=10,
+    financial_status = models.PositiveSmallIntegerField(
         choices=FinancialStatus.choices,
         db_index=True,
     )
@@ -147,24 +198,41 @@ class StudentMetrics(models.Model):
     part_time_job = models.BooleanField(default=False)
 
     # Integer fields to allow smoother filtering/sorting, between 0 and 1440 (24h)
-    study_minutes = models.PositiveSmallIntegerField(
-        validators=[MinValueValidator(0), MaxValueValidator(1440)],
-        db_index=True
-    )
+    study_minutes = models.PositiveSmallIntegerField()
 
-    social_minutes = models.PositiveSmallIntegerField(
-        validators=[MinValueValidator(0), MaxValueValidator(1440)],
-        db_index=True
-    )
+    social_minutes = models.PositiveSmallIntegerField()
 
-    travel_minutes = models.PositiveSmallIntegerField(
-        validators=[MinValueValidator(0), MaxValueValidator(1440)],
-        db_index=True
-    )
+    travel_minutes = models.PositiveSmallIntegerField()
 
     class Meta:
         # Order using id of the student entry
         ordering = ['student__id']
 
+        indexes = [
+            # Risk list: filter by stress level, then range + order by college mark
+            models.Index(fields=['stress_level', 'college_mark'], name='sm_stress_mark_idx'),
+            # Smaller partial index for the high stress levels the risk list is normally queried with
+            models.Index(
+                fields=['college_mark'],
+                condition=Q(stress_level__in=[StressLevel.BAD, StressLevel.AWFUL]),
+                name='sm_risk_idx',
+            ),
+            # Part-time impact / study time analytics: group key + averaged mark
+            models.Index(fields=['part_time_job', 'college_mark'], name='sm_parttime_mark_idx'),
+            models.Index(fields=['daily_studying_time', 'college_mark'], name='sm_studytime_mark_idx'),
+        ]
+
+        constraints = [
+            range_constraint('sm', 'mark_10th', 0, 100),
+            range_constraint('sm', 'mark_12th', 0, 100),
+            range_constraint('sm', 'college_mark', 0, 100),
+            range_constraint('sm', 'salary_expectation', 0, 10_000_000),
+            range_constraint('sm', 'willingness_percent', 0, 100),
+            # Between 0 and 1440 (24h)
+            range_constraint('sm', 'study_minutes', 0, 1440),
+            range_constraint('sm', 'social_minutes', 0, 1440),
+            range_constraint('sm', 'travel_minutes', 0, 1440),
+        ]
+
     def __str__(self) -> str:
         return f'Metrics for Student #{self.student.pk}'
\ No newline at end of file
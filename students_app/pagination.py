@@ -0,0 +1,10 @@
+from rest_framework.pagination import CursorPagination
+
+
+class StudentCursorPagination(CursorPagination):
+    '''
+    Keyset pagination for the students list: `WHERE id > <last seen id> LIMIT n` (indexed seek, no OFFSET scan
+    and no COUNT(*)), so deep pages cost the same as the first one. Clients follow the `next`/`previous` links
+    '''
+    # Same order as the model default, so rows come out as before
+    ordering = 'id'
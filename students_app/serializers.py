@@ -1,22 +1,122 @@
 from rest_framework import serializers
-from django.db import transaction
+from django.db import models, transaction
+from functools import cache
+from typing import Any, Iterable
+import copy
 
 from students_app.models import Student, StudentMetrics, Department, Hobby
+from students_app.cache import bump_data_version_on_commit
 from students_app.contstants import (
     DAILY_STUDY_TIME_MAP,
     MEDIA_VIDEO_TIME_MAP,
     TRAVELING_TIME_MAP,
 )
 
-def minutes_from_enum(map: dict[str, tuple], enum_value: str) -> int:
+# Reverse maps (enum value -> minutes), built once at import
+DAILY_STUDY_MINUTES = {enum: mins for _, (enum, mins) in DAILY_STUDY_TIME_MAP.items()}
+MEDIA_VIDEO_MINUTES = {enum: mins for _, (enum, mins) in MEDIA_VIDEO_TIME_MAP.items()}
+TRAVELING_MINUTES = {enum: mins for _, (enum, mins) in TRAVELING_TIME_MAP.items()}
+
+def minutes_from_enum(minutes_map: dict[str, int], enum_value: str) -> int:
+    '''
+    Get time in minutes for enum value, using one of the reverse maps above
+    '''
+    try:
+        return minutes_map[enum_value]
+    except KeyError:
+        raise serializers.ValidationError(f'Unsupported enum value: {enum_value!r}')
+
+
+
+class LabelChoiceField(serializers.ChoiceField):
+    '''
+    Choice field for int coded choices (IntegerChoices): DB keeps the small int code,
+    API reads and writes the label ('Bad', 'Morning', ...). Raw codes are accepted on input too
+    '''
+    def __init__(self, choices, **kwargs):
+        super().__init__(choices, **kwargs)
+        self._code_by_label = {str(label): code for code, label in self.choices.items()}
+
+    def to_internal_value(self, data):
+        try:
+            return self._code_by_label[data]
+        except (KeyError, TypeError):
+            return super().to_internal_value(data)
+
+    def to_representation(self, value):
+        if value in ('', None):
+            return value
+
+        return self.choices.get(value, value)
+
+
+
+class LabelChoicesModelSerializer(serializers.ModelSerializer):
     '''
-    Get time in minutes from the map using enum label
+    ModelSerializer that exposes int coded choice fields by label (see LabelChoiceField)
     '''
-    for _, (enum, mins) in map.items():
-        if enum == enum_value:
-            return mins
+    def build_standard_field(self, field_name, model_field):
+        field_class, field_kwargs = super().build_standard_field(field_name, model_field)
+
+        if field_class is self.serializer_choice_field and isinstance(model_field, models.IntegerField):
+            field_class = LabelChoiceField
+
+        return field_class, field_kwargs
+
+
+
+class CachedPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+    '''
+    PK related field that remembers resolved objects, so repeated ids (e.g. in many=True payloads)
+    hit the DB once. Fields are copied per serializer instance, so the cache lives for one request
+    '''
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._resolved: dict[tuple[type, Any], Any] = {}
+
+    def to_internal_value(self, data):
+        # Keyed by type too, so `True` doesn't hit the cache of pk 1 (DRF rejects bools)
+        key = (type(data), data)
+
+        try:
+            return self._resolved[key]
+        except (KeyError, TypeError):
+            pass
+
+        obj = super().to_internal_value(data)
+        self._resolved[key] = obj
+
+        return obj
+
+
+
+class CachedFieldsModelSerializer(serializers.ModelSerializer):
+    '''
+    ModelSerializer that builds its fields from model introspection once per class.
+    Every instance gets a deep copy (fields are bound to their parent, so they can't be shared)
+    '''
+    _fields_cache: dict[type, dict[str, serializers.Field]] = {}
+
+    def get_fields(self):
+        cls = type(self)
+        fields = CachedFieldsModelSerializer._fields_cache.get(cls)
 
-    raise serializers.ValidationError(f'Unsupported enum value: {enum_value!r}')
+        if fields is None:
+            fields = super().get_fields()
+            CachedFieldsModelSerializer._fields_cache[cls] = fields
+
+        return copy.deepcopy(fields)
+
+    @classmethod
+    def warm_fields_cache(cls) -> None:
+        '''
+        Build cached fields of all (imported) subclasses up front, so the first request doesn't pay for it
+        '''
+        for subclass in cls.__subclasses__():
+            if subclass not in CachedFieldsModelSerializer._fields_cache:
+                subclass().get_fields()
+
+            subclass.warm_fields_cache()
 
 
 
@@ -36,6 +136,10 @@ class _NameValidationSerializer:
 
         trimmed = value.strip()
 
+        # Fast path: valid name is a single range check, detailed messages below only for invalid ones
+        if self.NAME_MIN_LEN <= len(trimmed) <= self.NAME_MAX_LEN:
+            return trimmed
+
         if not trimmed:
             raise serializers.ValidationError('Name cannot be empty or only spaces.')
 
@@ -49,7 +153,7 @@ class _NameValidationSerializer:
 
 
 
-class DepartmentSerializer(_NameValidationSerializer, serializers.ModelSerializer):
+class DepartmentSerializer(_NameValidationSerializer, CachedFieldsModelSerializer):
     name = serializers.CharField(required=True, allow_blank=False)
 
     class Meta:
@@ -58,7 +162,7 @@ class DepartmentSerializer(_NameValidationSerializer, serializers.ModelSerialize
 
 
 
-class HobbySerializer(_NameValidationSerializer, serializers.ModelSerializer):
+class HobbySerializer(_NameValidationSerializer, CachedFieldsModelSerializer):
     name = serializers.CharField(required=True, allow_blank=False)
 
     class Meta:
@@ -69,7 +173,7 @@ class HobbySerializer(_NameValidationSerializer, serializers.ModelSerializer):
 
 # === STUDENT SERIALIZRS ===
 
-class StudentMetricsReadSerializer(serializers.ModelSerializer):
+class StudentMetricsReadSerializer(CachedFieldsModelSerializer, LabelChoicesModelSerializer):
     class Meta:
         model = StudentMetrics
         # We hide foreighn key
@@ -77,7 +181,7 @@ class StudentMetricsReadSerializer(serializers.ModelSerializer):
 
 
 
-class StudentMetricsWriteSerializer(serializers.ModelSerializer):
+class StudentMetricsWriteSerializer(CachedFieldsModelSerializer, LabelChoicesModelSerializer):
     # Prevent clients from providing minutes directly, we compute that field ourselves
     study_minutes = serializers.IntegerField(read_only=True)
     social_minutes = serializers.IntegerField(read_only=True)
@@ -90,17 +194,17 @@ class StudentMetricsWriteSerializer(serializers.ModelSerializer):
     # Populate 'calc' field using enum value
     def validate(self, attrs):
         if 'daily_studying_time' in attrs:
-            attrs['study_minutes'] = minutes_from_enum(DAILY_STUDY_TIME_MAP, attrs['daily_studying_time'])
+            attrs['study_minutes'] = minutes_from_enum(DAILY_STUDY_MINUTES, attrs['daily_studying_time'])
         if 'social_media_video' in attrs:
-            attrs['social_minutes'] = minutes_from_enum(MEDIA_VIDEO_TIME_MAP, attrs['social_media_video'])
+            attrs['social_minutes'] = minutes_from_enum(MEDIA_VIDEO_MINUTES, attrs['social_media_video'])
         if 'travelling_time' in attrs:
-            attrs['travel_minutes'] = minutes_from_enum(TRAVELING_TIME_MAP, attrs['travelling_time'])
+            attrs['travel_minutes'] = minutes_from_enum(TRAVELING_MINUTES, attrs['travelling_time'])
 
         return attrs
 
 
 
-class StudentReadSerializer(serializers.ModelSerializer):
+class StudentReadSerializer(CachedFieldsModelSerializer):
     department = DepartmentSerializer(read_only=True)
     hobby = HobbySerializer(read_only=True)
     metrics = StudentMetricsReadSerializer(read_only=True)
@@ -117,46 +221,129 @@ class StudentReadSerializer(serializers.ModelSerializer):
             'metrics',
         ]
         read_only_fields = ['id']
-    
-    @transaction.atomic
-    def create(self, validated_data):
-        # Separate metrics and student data
-        metrics_data = validated_data.pop('metrics')
 
-        # Create both entities
-        student = Student.objects.create(**validated_data)
-        StudentMetrics.objects.create(student=student, **metrics_data)
+    @classmethod
+    @cache
+    def nested_relations(cls) -> dict[str, type[serializers.ModelSerializer]]:
+        '''
+        Relation name -> nested serializer class, for the related objects this serializer outputs
+        '''
+        return {
+            name: type(field)
+            for name, field in cls._declared_fields.items()
+            if isinstance(field, serializers.ModelSerializer)
+        }
+
+    @classmethod
+    @cache
+    def read_columns(cls) -> tuple[str, ...]:
+        '''
+        Columns this serializer outputs, derived from Meta.fields (and the nested serializers' fields)
+        '''
+        nested = cls.nested_relations()
+        columns = [name for name in cls.Meta.fields if name not in nested]
+
+        for name, nested_cls in nested.items():
+            if hasattr(nested_cls.Meta, 'fields'):
+                columns.extend(f'{name}__{field}' for field in nested_cls.Meta.fields)
+            else:
+                # `exclude` serializers: all columns, incl. the FK back to student (w/o it Django re-queries per row)
+                columns.extend(f'{name}__{field.name}' for field in nested_cls.Meta.model._meta.concrete_fields)
+
+        return tuple(columns)
+
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        '''
+        Join every nested relation up front, so reading students stays a single query (no N+1),
+        and only load the columns this serializer outputs
+        '''
+        # All nested relations are single valued (department/hobby FKs, metrics is the reverse side of a
+        # OneToOneField), so one JOIN covers them. A to-many relation would need prefetch_related instead
+        return queryset.select_related(*cls.nested_relations()).only(*cls.read_columns())
+
+
+
+# === FAST LIST READS ===
+# Same output as StudentReadSerializer, built straight from .values() rows (no per-row field binding).
+# Metrics columns in serializer order, int coded choices mapped back to their labels
+METRICS_READ_FIELDS = [field.name for field in StudentMetrics._meta.concrete_fields if field.name != 'student']
+METRICS_LABELS = {
+    field.name: dict(field.choices)
+    for field in StudentMetrics._meta.concrete_fields
+    if field.choices and isinstance(field, models.IntegerField)
+}
+STUDENT_LIST_VALUES = (
+    'id', 'gender', 'department_id', 'department__name', 'height_cm', 'weight_kg', 'hobby_id', 'hobby__name',
+    *(f'metrics__{name}' for name in METRICS_READ_FIELDS),
+)
 
-        return student
+def student_list_rows(values_rows: Iterable[dict[str, Any]]) -> list[dict[str, Any]]:
+    '''
+    Nest flat `STUDENT_LIST_VALUES` rows into the StudentReadSerializer shape
+    '''
+    rows = []
 
-    @transaction.atomic
-    def update(self, instance, validated_data):
-        metrics_data = validated_data.pop('metrics', None)
+    for values in values_rows:
+        row = {
+            'id': values['id'],
+            'gender': values['gender'],
+            'department': {'id': values['department_id'], 'name': values['department__name']},
+            'height_cm': values['height_cm'],
+            'weight_kg': values['weight_kg'],
+            'hobby': {'id': values['hobby_id'], 'name': values['hobby__name']},
+            # No metrics row -> null, same as the serializer
+            'metrics': None,
+        }
 
-        # Update Student fields
-        for attr, value in validated_data.items():
-            setattr(instance, attr, value)
+        if values['metrics__id'] is not None:
+            metrics = {name: values[f'metrics__{name}'] for name in METRICS_READ_FIELDS}
 
-        instance.save()
+            for name, labels in METRICS_LABELS.items():
+                metrics[name] = labels.get(metrics[name], metrics[name])
 
-        # Update metrics (OneToOne)
-        if metrics_data is not None:
-            metrics = instance.metrics
+            row['metrics'] = metrics
 
-            for attr, value in metrics_data.items():
-                setattr(metrics, attr, value)
+        rows.append(row)
+
+    return rows
+
+
+
+class StudentBulkCreateSerializer(serializers.ListSerializer):
+    '''
+    many=True create: all students in one bulk INSERT, then all their metrics in another
+    (2 INSERTs instead of 2 per student). Meant for seeding/imports, API keeps single-row create
+    '''
+    @transaction.atomic
+    def create(self, validated_data):
+        metrics_payloads = [item.pop('metrics') for item in validated_data]
+        students = [Student(**item) for item in validated_data]
+
+        # bulk_create skips save(), so fill derived columns here
+        for student in students:
+            student.set_derived_fields()
+
+        Student.objects.bulk_create(students)
+        StudentMetrics.objects.bulk_create(
+            [
+                StudentMetrics(student=student, **metrics)
+                for student, metrics in zip(students, metrics_payloads)
+            ]
+        )
 
-            metrics.save()
+        # No post_save signals either, invalidate cached analytics manually
+        bump_data_version_on_commit()
 
-        return instance
+        return students
 
 
 
-class StudentWriteSerializer(serializers.ModelSerializer):
-    department = serializers.PrimaryKeyRelatedField(
+class StudentWriteSerializer(CachedFieldsModelSerializer):
+    department = CachedPrimaryKeyRelatedField(
         queryset=Department.objects.all()
     )
-    hobby = serializers.PrimaryKeyRelatedField(
+    hobby = CachedPrimaryKeyRelatedField(
         queryset=Hobby.objects.all()
     )
     metrics = StudentMetricsWriteSerializer()
@@ -173,6 +360,7 @@ class StudentWriteSerializer(serializers.ModelSerializer):
             'metrics',
         ]
         read_only_fields = ['id']
+        list_serializer_class = StudentBulkCreateSerializer
 
     @transaction.atomic
     def create(self, validated_data):
@@ -188,19 +376,20 @@ class StudentWriteSerializer(serializers.ModelSerializer):
     def update(self, instance, validated_data):
         metrics_data = validated_data.pop('metrics', None)
 
-        # Update non metric fields first
+        # Update non metric fields first, UPDATE only the columns sent (nothing sent -> no query)
         for attr, value in validated_data.items():
             setattr(instance, attr, value)
 
-        instance.save()
+        if validated_data:
+            instance.save(update_fields=list(validated_data))
 
         # Then add metric ones
-        if metrics_data is not None:
+        if metrics_data:
             metrics = instance.metrics
 
             for attr, value in metrics_data.items():
                 setattr(metrics, attr, value)
 
-            metrics.save()
+            metrics.save(update_fields=list(metrics_data))
 
         return instance
\ No newline at end of file
@@ -0,0 +1,56 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from contextlib import contextmanager
+
+from students_app.cache import bump_data_version_on_commit
+from students_app.models import Student, StudentMetrics, Department, Hobby
+
+
+# Any change of the students data makes cached analytics outdated
+@receiver(post_save, sender=Student)
+@receiver(post_delete, sender=Student)
+@receiver(post_save, sender=StudentMetrics)
+@receiver(post_delete, sender=StudentMetrics)
+@receiver(post_save, sender=Department)
+@receiver(post_delete, sender=Department)
+@receiver(post_save, sender=Hobby)
+@receiver(post_delete, sender=Hobby)
+def invalidate_analytics(sender, **kwargs):
+    bump_data_version_on_commit()
+
+
+# Models whose post_delete triggers invalidation
+INVALIDATED_BY_DELETE = (Student, StudentMetrics, Department, Hobby)
+
+@contextmanager
+def delete_invalidation_paused():
+    '''
+    Disconnect the post_delete invalidation receivers for a bulk delete: any post_delete receiver makes
+    Django load and delete rows one by one (no fast delete), plus a version bump per row.
+    Caller bumps the data version once itself. Process-wide, so meant for management commands
+    '''
+    for sender in INVALIDATED_BY_DELETE:
+        post_delete.disconnect(invalidate_analytics, sender=sender)
+
+    try:
+        yield
+    finally:
+        for sender in INVALIDATED_BY_DELETE:
+            post_delete.connect(invalidate_analytics, sender=sender)
+
+
+# Keep denormalized names on Student in sync (renames are rare, so a single UPDATE is fine)
+@receiver(post_save, sender=Department)
+def sync_department_name(sender, instance, created, **kwargs):
+    if not created:
+        Student.objects.filter(department=instance).exclude(department_name=instance.name).update(
+            department_name=instance.name
+        )
+
+
+@receiver(post_save, sender=Hobby)
+def sync_hobby_name(sender, instance, created, **kwargs):
+    if not created:
+        Student.objects.filter(hobby=instance).exclude(hobby_name=instance.name).update(
+            hobby_name=instance.name
+        )
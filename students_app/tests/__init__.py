@@ -0,0 +1,3 @@
+# Tests that go through the cache run on a private local memory cache, so clear() never flushes
+# a real Redis when REDIS_URL is set
+LOCMEM_CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'tests'}}
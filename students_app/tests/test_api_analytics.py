@@ -1,17 +1,24 @@
 from rest_framework.test import APITestCase
 from rest_framework import status
+from django.core.cache import cache
+from django.test import override_settings
 
+from students_app.cache import data_version
 from students_app.models import Student, StudentMetrics, Department, Hobby
+from students_app.serializers import DAILY_STUDY_MINUTES, MEDIA_VIDEO_MINUTES, TRAVELING_MINUTES
+from students_app.tests import LOCMEM_CACHES
 from students_app.contstants import (
     DailyStudyTime,
     MediaVideoTime,
     TravelingTime,
     StudyPreference,
     FinancialStatus,
+    StressLevel,
 )
 
 
 
+@override_settings(CACHES=LOCMEM_CACHES)
 class AnalyticsApiTests(APITestCase):
     # Analytic routes
     STUDENTS = '/api/students'
@@ -60,68 +67,78 @@ class AnalyticsApiTests(APITestCase):
             },
         }
 
-        # Make POST request and create student entity
-        res = self.client.post(self.STUDENTS, payload, format='json')
+        # Make POST request and create student entity. Cache is invalidated on commit, which the test
+        # transaction never does, so run the commit hooks here
+        with self.captureOnCommitCallbacks(execute=True):
+            res = self.client.post(self.STUDENTS, payload, format='json')
 
         self.assertEqual(res.status_code, status.HTTP_201_CREATED, res.content.decode('utf-8'))
 
         return res.json()
 
-    # Setup small dummy dataset with fixed values, ready for testing
-    def setUp(self):
+    # Setup small dummy dataset with fixed values, ready for testing (once per class, each test is rolled back)
+    @classmethod
+    def setUpTestData(cls):
         # Test Departments and Hobbies
-        self.dep_cse = Department.objects.create(name='CSE')
-        self.dep_bca = Department.objects.create(name='BCA')
-        self.hob_reading = Hobby.objects.create(name='Reading')
-        self.hob_gaming = Hobby.objects.create(name='Gaming')
+        cls.dep_cse = Department.objects.create(name='CSE')
+        cls.dep_bca = Department.objects.create(name='BCA')
+        cls.hob_reading = Hobby.objects.create(name='Reading')
+        cls.hob_gaming = Hobby.objects.create(name='Gaming')
 
         # Enum options
-        self.daily_study_a = DailyStudyTime.choices[0][0]
-        self.daily_study_b = DailyStudyTime.choices[1][0] if len(DailyStudyTime.choices) > 1 else self.daily_study_a
-        self.media = MediaVideoTime.choices[0][0]
-        self.travel = TravelingTime.choices[0][0]
-        self.pref = StudyPreference.choices[0][0]
-        self.fin = FinancialStatus.choices[0][0]
-
-        # Create a small dummy dataset
-        # Student 1: Part-time job, Bad stress, Low mark ('risky' student)
-        self._create_student_api(
-            gender='Male',
-            department_pk=self.dep_cse.pk,
-            hobby_pk=self.hob_reading.pk,
-            height_cm=170,
-            weight_kg=70,
-            college_mark=45,
-            stress_level='Bad',
-            part_time_job=True,
-            daily_studying_time=self.daily_study_a,
-        )
-
-        # Student 2: No part-time job, Good stress, High mark
-        self._create_student_api(
-            gender='Female',
-            department_pk=self.dep_cse.pk,
-            hobby_pk=self.hob_gaming.pk,
-            height_cm=160,
-            weight_kg=50,
-            college_mark=88,
-            stress_level='Good',
-            part_time_job=False,
-            daily_studying_time=self.daily_study_b,
+        cls.daily_study_a = DailyStudyTime.M0_30
+        cls.daily_study_b = DailyStudyTime.M30_60
+        cls.media = MediaVideoTime.M0
+        cls.travel = TravelingTime.M0_30
+        cls.pref = StudyPreference.MORNING
+        cls.fin = FinancialStatus.AWFUL
+
+        # Create a small dummy dataset directly with ORM (API create flow is covered by CRUD tests)
+        rows = [
+            # Student 1: Part-time job, Bad stress, Low mark ('risky' student)
+            (Student(gender='Male', department=cls.dep_cse, hobby=cls.hob_reading, height_cm=170, weight_kg=70),
+             {'college_mark': 45, 'stress_level': StressLevel.BAD, 'part_time_job': True, 'daily_studying_time': cls.daily_study_a}),
+            # Student 2: No part-time job, Good stress, High mark
+            (Student(gender='Female', department=cls.dep_cse, hobby=cls.hob_gaming, height_cm=160, weight_kg=50),
+             {'college_mark': 88, 'stress_level': StressLevel.GOOD, 'part_time_job': False, 'daily_studying_time': cls.daily_study_b}),
+            # Student 3: Different department, Bad stress, Mark 60 (default threshold value)
+            (Student(gender='Male', department=cls.dep_bca, hobby=cls.hob_reading, height_cm=180, weight_kg=90),
+             {'college_mark': 50, 'stress_level': StressLevel.BAD, 'part_time_job': False, 'daily_studying_time': cls.daily_study_a}),
+        ]
+
+        students = [student for student, _ in rows]
+
+        # bulk_create skips save(), so fill derived columns here
+        for student in students:
+            student.set_derived_fields()
+
+        Student.objects.bulk_create(students)
+        StudentMetrics.objects.bulk_create(
+            [
+                StudentMetrics(
+                    student=student,
+                    certification_course=False,
+                    mark_10th=70,
+                    mark_12th=70,
+                    prefer_to_study_in=cls.pref,
+                    salary_expectation=50000,
+                    likes_degree=True,
+                    financial_status=cls.fin,
+                    willingness_percent=60,
+                    social_media_video=cls.media,
+                    travelling_time=cls.travel,
+                    study_minutes=DAILY_STUDY_MINUTES[metrics['daily_studying_time']],
+                    social_minutes=MEDIA_VIDEO_MINUTES[cls.media],
+                    travel_minutes=TRAVELING_MINUTES[cls.travel],
+                    **metrics,
+                )
+                for student, metrics in rows
+            ]
         )
 
-        # Student 3: Different department, Bad stress, Mark 60 (default threshold value)
-        self._create_student_api(
-            gender='Male',
-            department_pk=self.dep_bca.pk,
-            hobby_pk=self.hob_reading.pk,
-            height_cm=180,
-            weight_kg=90,
-            college_mark=50,
-            stress_level='Bad',
-            part_time_job=False,
-            daily_studying_time=self.daily_study_a,
-        )
+    def setUp(self):
+        # DB is rolled back between tests, but the cache is not (and bulk_create sends no invalidation signals)
+        cache.clear()
 
 
 
@@ -143,6 +160,93 @@ class AnalyticsApiTests(APITestCase):
         self.assertEqual(payload['results'][0]['gender'], 'Female')
         self.assertTrue('id' in payload['results'][0] or 'pk' in payload['results'][0])
 
+    def test_students_search_filters_by_metrics(self):
+        # Bad stress + mark >= 48 leaves only student 3 (BCA, mark 50)
+        res = self.client.get(
+            self.STUDENTS_SEARCH,
+            {'stress_level': 'Bad', 'part_time_job': 'no', 'min_college_mark': 48},
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK, res.content.decode('utf-8'))
+
+        payload = res.json()
+
+        self.assertEqual(payload['count'], 1)
+        self.assertEqual(payload['results'][0]['department'], 'BCA')
+        self.assertEqual(payload['results'][0]['college_mark'], 50)
+
+        # Parsed filters are echoed back
+        self.assertFalse(payload['filters']['part_time_job'])
+        self.assertEqual(payload['filters']['min_college_mark'], 48.0)
+        self.assertIsNone(payload['filters']['department'])
+
+
+    def test_students_search_handles_student_without_metrics(self):
+        # Admin/ORM creates allow a student w/o metrics row (LEFT JOIN gives null metrics columns)
+        lone = Student.objects.create(gender='Male', department=self.dep_bca, hobby=self.hob_gaming, height_cm=175, weight_kg=70)
+
+        payload = self.client.get(self.STUDENTS_SEARCH, {'hobby': self.hob_gaming.pk}).json()
+        row = next(row for row in payload['results'] if row['id'] == lone.pk)
+
+        self.assertIsNone(row['stress_level'])
+        self.assertIsNone(row['college_mark'])
+
+        # Unknown label matches nothing (not the metrics-less student via IS NULL)
+        res = self.client.get(self.STUDENTS_SEARCH, {'stress_level': 'Nope'})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK, res.content.decode('utf-8'))
+        self.assertEqual(res.json()['count'], 0)
+
+        res = self.client.get(self.RISK_LIST, {'stress_level': 'Nope', 'max_college_mark': 100})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK, res.content.decode('utf-8'))
+        self.assertEqual(res.json()['count'], 0)
+
+    def test_students_search_is_cached_per_params(self):
+        params = {'department': self.dep_cse.pk, 'limit': 10}
+        first = self.client.get(self.STUDENTS_SEARCH, params).json()
+
+        # Same params -> served from cache
+        with self.assertNumQueries(0):
+            cached = self.client.get(self.STUDENTS_SEARCH, params).json()
+
+        self.assertEqual(cached, first)
+
+        # Different params -> own entry
+        other = self.client.get(self.STUDENTS_SEARCH, {'department': self.dep_bca.pk}).json()
+        self.assertEqual(other['count'], 1)
+
+        # Writes invalidate every cached search
+        self._create_student_api(
+            gender='Female',
+            department_pk=self.dep_cse.pk,
+            hobby_pk=self.hob_gaming.pk,
+            height_cm=165,
+            weight_kg=55,
+            college_mark=70,
+            stress_level='Good',
+            part_time_job=True,
+            daily_studying_time=self.daily_study_b,
+        )
+
+        self.assertEqual(self.client.get(self.STUDENTS_SEARCH, params).json()['count'], 3)
+
+    def test_students_search_ignores_malformed_numbers(self):
+        res = self.client.get(
+            self.STUDENTS_SEARCH,
+            {'department': 'abc', 'min_college_mark': 'nan', 'limit': '1.5'},
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK, res.content.decode('utf-8'))
+
+        payload = res.json()
+
+        # Bad values are dropped (no filter, default limit)
+        self.assertIsNone(payload['filters']['department'])
+        self.assertIsNone(payload['filters']['min_college_mark'])
+        self.assertEqual(payload['filters']['limit'], 50)
+        self.assertEqual(payload['count'], 3)
+
 
 
     # === ENDPOINT 2: Department summary ===
@@ -165,6 +269,66 @@ class AnalyticsApiTests(APITestCase):
         cse_row = next(r for r in payload['results'] if r['department_name'] == 'CSE')
 
         self.assertEqual(cse_row['student_count'], 2)
+        self.assertEqual(cse_row['avg_college_mark'], 66.5)
+
+        # One 'Bad' and one 'Good' student in CSE
+        self.assertEqual(cse_row['stress_distribution']['Bad'], 1)
+        self.assertEqual(cse_row['stress_distribution']['Good'], 1)
+
+
+    def test_departments_summary_counts_students_without_metrics(self):
+        Student.objects.create(gender='Male', department=self.dep_cse, hobby=self.hob_gaming, height_cm=175, weight_kg=70)
+
+        res = self.client.get(self.DEPT_SUMMARY)
+        cse_row = next(r for r in res.json()['results'] if r['department_name'] == 'CSE')
+
+        # Counted as a student, but adds nothing to the averages or the stress distribution
+        self.assertEqual(cse_row['student_count'], 3)
+        self.assertEqual(cse_row['avg_college_mark'], 66.5)
+        self.assertEqual(sum(cse_row['stress_distribution'].values()), 2)
+
+    def test_departments_summary_cache_invalidated_on_write(self):
+        # First request fills the cache
+        res = self.client.get(self.DEPT_SUMMARY)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK, res.content.decode('utf-8'))
+
+        # New student in BCA department should be visible straight away
+        self._create_student_api(
+            gender='Female',
+            department_pk=self.dep_bca.pk,
+            hobby_pk=self.hob_gaming.pk,
+            height_cm=165,
+            weight_kg=55,
+            college_mark=70,
+            stress_level='Good',
+            part_time_job=True,
+            daily_studying_time=self.daily_study_b,
+        )
+
+        res = self.client.get(self.DEPT_SUMMARY)
+        bca_row = next(r for r in res.json()['results'] if r['department_name'] == 'BCA')
+
+        self.assertEqual(bca_row['student_count'], 2)
+
+
+    def test_data_version_bumped_only_after_commit(self):
+        before = data_version()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Department.objects.create(name='EEE')
+
+            # Still inside the transaction: a concurrent read must not cache uncommitted data as the new version
+            self.assertEqual(data_version(), before)
+
+        self.assertGreater(data_version(), before)
+
+    def test_departments_summary_query_count(self):
+        # One grouped query (departments LEFT JOIN metrics), no per-department (or DISTINCT) subqueries
+        with self.assertNumQueries(1):
+            res = self.client.get(self.DEPT_SUMMARY)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK, res.content.decode('utf-8'))
 
     
 
@@ -230,6 +394,12 @@ class AnalyticsApiTests(APITestCase):
         self.assertIn(45, marks)
         self.assertIn(50, marks)
 
+        # Response row shape
+        self.assertEqual(
+            set(payload['results'][0]),
+            {'id', 'gender', 'department', 'hobby', 'college_mark', 'stress_level', 'part_time_job'},
+        )
+
 
 
     # === ENDPOINT 6: BMI distribution ===
@@ -250,6 +420,11 @@ class AnalyticsApiTests(APITestCase):
         self.assertIn('buckets', row)
         self.assertIn('avg_bmi', row)
 
+        # Without grouping all students end up in one row (BMI: 24.2, 19.5, 27.8)
+        self.assertEqual(payload['count'], 1)
+        self.assertEqual(row['total'], 3)
+        self.assertEqual(row['buckets'], {'underweight': 0, 'normal': 2, 'overweight': 1, 'obese': 0})
+
     def test_bmi_distribution_group_by_gender(self):
         res = self.client.get(self.BMI_DIST, {'by': 'gender'})
 
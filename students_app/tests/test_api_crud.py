@@ -1,9 +1,23 @@
 from rest_framework.test import APITestCase
 from rest_framework import status
 from typing import Any
+import json
+from unittest import mock
 from django.http import HttpResponse
+from django.test import override_settings
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 
 from students_app.models import Student, StudentMetrics, Department, Hobby
+from students_app.pagination import StudentCursorPagination
+from students_app.views import StudentListCreateView
+from students_app.serializers import (
+    StudentReadSerializer,
+    DAILY_STUDY_MINUTES,
+    MEDIA_VIDEO_MINUTES,
+    TRAVELING_MINUTES,
+)
+from students_app.tests import LOCMEM_CACHES
 from students_app.contstants import (
     DailyStudyTime,
     MediaVideoTime,
@@ -17,72 +31,98 @@ def json_or_text(res: HttpResponse) -> Any:
     '''
     Helper function to safely access response payload and fix type errors
     '''
+    # DRF responses keep the payload they were rendered from, no need to parse the JSON back
+    data = getattr(res, 'data', None)
+    if data is not None:
+        return data
+
     try:
         return res.json()
     except Exception:
-        try:
-            return res.content.decode('utf-8')
-        except Exception:
-            return str(res)
-
-
-
+        return res.content.decode('utf-8', errors='replace')
+
+
+
+# Accepted status codes, for responses where the API may answer either way
+OK_OR_ACCEPTED = (status.HTTP_200_OK, status.HTTP_202_ACCEPTED)
+OK_OR_NO_CONTENT = (status.HTTP_204_NO_CONTENT, status.HTTP_200_OK)
+CONFLICT_OR_BAD_REQUEST = (status.HTTP_409_CONFLICT, status.HTTP_400_BAD_REQUEST)
+
+# Payload template (FK ids are filled per test), any valid enum members will do
+STUDENT_PAYLOAD = {
+    'gender': 'Male',
+    'height_cm': 170,
+    'weight_kg': 69,
+    'metrics': {
+        'certification_course': True,
+        'mark_10th': 80,
+        'mark_12th': 85,
+        'college_mark': 78,
+        'daily_studying_time': DailyStudyTime.M0_30,
+        'prefer_to_study_in': StudyPreference.MORNING,
+        'salary_expectation': 50000,
+        'likes_degree': True,
+        'part_time_job': False,
+        'financial_status': FinancialStatus.AWFUL,
+        'willingness_percent': 70,
+        'social_media_video': MediaVideoTime.M0,
+        'travelling_time': TravelingTime.M0_30,
+        'stress_level': StressLevel.GOOD,
+    },
+}
+
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
 class CrudApiTests(APITestCase):
     BASE_STUDENTS = '/api/students'
     BASE_DEPARTMENTS = '/api/departments'
     BASE_HOBBIES = '/api/hobbies'
 
-    def setUp(self):
-        # Create dummy department and hobby
-        self.department = Department.objects.create(name='CSE')
-        self.hobby = Hobby.objects.create(name='Reading')
+    @classmethod
+    def setUpTestData(cls):
+        # Create dummy department and hobby (once per class)
+        cls.department = Department.objects.create(name='CSE')
+        cls.hobby = Hobby.objects.create(name='Reading')
 
-    def _student_payload(self):
-        # Just pick enum values
-        daily_study = DailyStudyTime.choices[0][0]
-        media = MediaVideoTime.choices[0][0]
-        travel = TravelingTime.choices[0][0]
-        pref = StudyPreference.choices[0][0]
-        stress = StressLevel.choices[0][0]
-        fin = FinancialStatus.choices[0][0]
+        # Unmodified payload is encoded once, tests that tweak it go through _student_payload()
+        cls.student_payload_json = json.dumps({
+            **STUDENT_PAYLOAD,
+            'department': cls.department.pk,
+            'hobby': cls.hobby.pk,
+        }).encode()
 
+    def _student_payload(self):
+        # Fresh copy per call (tests mutate it), metrics too
         return {
-            'gender': 'Male',
+            **STUDENT_PAYLOAD,
             'department': self.department.pk,
             'hobby': self.hobby.pk,
-            'height_cm': 170,
-            'weight_kg': 69,
-            'metrics': {
-                'certification_course': True,
-                'mark_10th': 80,
-                'mark_12th': 85,
-                'college_mark': 78,
-                'daily_studying_time': daily_study,
-                'prefer_to_study_in': pref,
-                'salary_expectation': 50000,
-                'likes_degree': True,
-                'part_time_job': False,
-                'financial_status': fin,
-                'willingness_percent': 70,
-                'social_media_video': media,
-                'travelling_time': travel,
-                'stress_level': stress,
-            },
+            'metrics': dict(STUDENT_PAYLOAD['metrics']),
         }
 
-    def _create_student_via_api(self):
-        res = self.client.post(self.BASE_STUDENTS, self._student_payload(), format='json')
-        payload = json_or_text(res)
-
-        self.assertEqual(res.status_code, status.HTTP_201_CREATED, payload)
-        self.assertEqual(Student.objects.count(), 1)
-        self.assertEqual(StudentMetrics.objects.count(), 1)
-
-        return payload
+    def _create_student_orm(self) -> Student:
+        '''
+        Arrange step for tests that act on an existing student: straight ORM inserts, the API create
+        flow is covered by its own tests
+        '''
+        fields = dict(STUDENT_PAYLOAD)
+        metrics = fields.pop('metrics')
+
+        student = Student.objects.create(department=self.department, hobby=self.hobby, **fields)
+        StudentMetrics.objects.create(
+            student=student,
+            study_minutes=DAILY_STUDY_MINUTES[metrics['daily_studying_time']],
+            social_minutes=MEDIA_VIDEO_MINUTES[metrics['social_media_video']],
+            travel_minutes=TRAVELING_MINUTES[metrics['travelling_time']],
+            **metrics,
+        )
+
+        return student
 
     # === STUDENTS CRUD ===
     def test_students_list_returns_200(self):
-        self._create_student_via_api()
+        self._create_student_orm()
         res = self.client.get(self.BASE_STUDENTS)
         payload = json_or_text(res)
 
@@ -94,150 +134,286 @@ class CrudApiTests(APITestCase):
         else:
             self.assertGreaterEqual(len(payload), 1)
 
+    def test_students_list_has_no_n_plus_one(self):
+        for _ in range(3):
+            self._create_student_orm()
+
+        # One joined select, regardless of the number of students (cursor pagination skips the COUNT)
+        with self.assertNumQueries(1):
+            res = self.client.get(self.BASE_STUDENTS)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(json_or_text(res)['results']), 3)
+
+    def test_students_list_pages_follow_cursor(self):
+        ids = [self._create_student_orm().pk for _ in range(3)]
+        seen = []
+        url = self.BASE_STUDENTS
+
+        with mock.patch.object(StudentCursorPagination, 'page_size', 2):
+            while url:
+                payload = json_or_text(self.client.get(url))
+                seen.extend(row['id'] for row in payload['results'])
+                url = payload['next']
+
+        # Every student once, in id order, and no COUNT(*) based total
+        self.assertEqual(seen, ids)
+        self.assertNotIn('count', payload)
+
+    def test_students_list_rows_match_read_serializer(self):
+        self._create_student_orm()
+        # Student w/o metrics row too (serialized as null)
+        Student.objects.create(department=self.department, hobby=self.hobby, gender='Female', height_cm=160, weight_kg=50)
+
+        res = self.client.get(self.BASE_STUDENTS)
+        rows = json_or_text(res)['results']
+        expected = StudentReadSerializer(Student.objects.all(), many=True).data
+
+        # List is built from .values() rows, output has to stay identical (incl. key order and choice labels)
+        self.assertEqual(rows, expected)
+        self.assertEqual([list(row) for row in rows], [list(row) for row in expected])
+        self.assertEqual([list(row['metrics']) for row in rows[:1]], [list(expected[0]['metrics'])])
+
+    def test_students_list_stream_returns_all_rows(self):
+        for _ in range(3):
+            self._create_student_orm()
+
+        paged = json_or_text(self.client.get(self.BASE_STUDENTS))['results']
+
+        # Chunk smaller than the table, so chunks have to join into one valid array
+        with mock.patch.object(StudentListCreateView, 'stream_chunk_size', 2):
+            res = self.client.get(self.BASE_STUDENTS, {'stream': '1'})
+            streamed = json.loads(b''.join(res.streaming_content))
+
+        self.assertEqual(res['Content-Type'], 'application/json')
+        self.assertEqual(streamed, paged)
+
+    def test_list_query_counts_are_fixed(self):
+        # Query budget per list GET, independent of the row count (guards against N+1 from new fields)
+        for _ in range(3):
+            self._create_student_orm()
+
+        for url, params, queries in (
+            # Cursor page: one joined select
+            (self.BASE_STUDENTS, {}, 1),
+            # Stream: one select, read in chunks from the same cursor
+            (self.BASE_STUDENTS, {'stream': '1'}, 1),
+            # Page number pagination: COUNT + select
+            (self.BASE_DEPARTMENTS, {}, 2),
+            (self.BASE_HOBBIES, {}, 2),
+        ):
+            with self.subTest(url=url, **params), self.assertNumQueries(queries):
+                res = self.client.get(url, params)
+                # Streaming body is only read (and queried) on consumption
+                if res.streaming:
+                    b''.join(res.streaming_content)
+
+    def test_students_list_conditional_get(self):
+        self._create_student_orm()
+
+        etag = self.client.get(self.BASE_STUDENTS)['ETag']
+
+        # Unchanged data: 304 straight from the data version, no queries
+        with self.assertNumQueries(0):
+            res = self.client.get(self.BASE_STUDENTS, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        # Any write moves the data version (on commit), old ETag no longer matches
+        with self.captureOnCommitCallbacks(execute=True):
+            self._create_student_orm()
+        res = self.client.get(self.BASE_STUDENTS, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(res['ETag'], etag)
+
     def test_students_create_creates_student_and_metrics(self):
-        res = self.client.post(self.BASE_STUDENTS, self._student_payload(), format='json')
+        res = self.client.post(self.BASE_STUDENTS, self.student_payload_json, content_type='application/json')
         payload = json_or_text(res)
+        # Response checks first, they cost no queries
         self.assertEqual(res.status_code, status.HTTP_201_CREATED, payload)
 
-        self.assertEqual(Student.objects.count(), 1)
-        self.assertEqual(StudentMetrics.objects.count(), 1)
-
         student_id = payload.get('id') or payload.get('pk')
 
         self.assertIsNotNone(student_id, f'Expected created student id in response, got: {payload}')
 
-        # Verify nested metrics exist in DB and link is correct
-        student = Student.objects.get(id=student_id)
-        metrics = StudentMetrics.objects.get(student=student)
+        # One joined select instead of two COUNTs: unfiltered get() fails unless there's exactly one student,
+        # and reading .metrics fails unless nested metrics were created and linked to it
+        with self.assertNumQueries(1):
+            student = Student.objects.select_related('metrics').get()
+
+        self.assertEqual(student.pk, student_id)
+        self.assertEqual(student.metrics.college_mark, 78)
+
+    def test_students_choice_labels_stored_as_codes(self):
+        payload = self._student_payload()
+        payload['metrics']['stress_level'] = 'Bad'
+        payload['metrics']['prefer_to_study_in'] = 'Night'
+
+        res = self.client.post(self.BASE_STUDENTS, payload, format='json')
+        body = json_or_text(res)
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED, body)
+
+        # API speaks labels, DB keeps int codes
+        self.assertEqual(body['metrics']['stress_level'], 'Bad')
+        self.assertEqual(body['metrics']['prefer_to_study_in'], 'Night')
 
-        self.assertEqual(metrics.college_mark, 78)
+        metrics = StudentMetrics.objects.get()
+        self.assertEqual(metrics.stress_level, StressLevel.BAD)
+        self.assertEqual(metrics.prefer_to_study_in, StudyPreference.NIGHT)
+
+        payload['metrics']['stress_level'] = 'Meh'
+        res = self.client.post(self.BASE_STUDENTS, payload, format='json')
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_students_create_out_of_range_returns_400(self):
+        payload = self._student_payload()
+        payload['metrics']['mark_10th'] = 150
+
+        res = self.client.post(self.BASE_STUDENTS, payload, format='json')
+
+        # Range is enforced by DB constraint, reported as a field error
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST, json_or_text(res))
+        self.assertIn('mark_10th', json_or_text(res))
+        self.assertEqual(Student.objects.count(), 0)
 
     def test_students_retrieve_returns_200(self):
-        created = self._create_student_via_api()
-        student_id = created.get('id') or created.get('pk')
+        student_id = self._create_student_orm().pk
 
-        res = self.client.get(f'{self.BASE_STUDENTS}/{student_id}')
+        # Single joined select (only serialized columns)
+        with self.assertNumQueries(1):
+            res = self.client.get(f'{self.BASE_STUDENTS}/{student_id}')
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
 
+    def test_students_patch_department_updates_denormalized_name(self):
+        student_id = self._create_student_orm().pk
+        other = Department.objects.create(name='EEE')
+
+        # Detail queryset defers some columns, save() still has to write the derived ones
+        res = self.client.patch(f'{self.BASE_STUDENTS}/{student_id}', {'department': other.pk}, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK, json_or_text(res))
+        self.assertEqual(Student.objects.get(pk=student_id).department_name, 'EEE')
+
     def test_students_patch_updates_metrics(self):
-        created = self._create_student_via_api()
-        student_id = created.get('id') or created.get('pk')
+        student = self._create_student_orm()
+        student_id = student.pk
 
-        student = Student.objects.get(id=student_id)
-        old_minutes = StudentMetrics.objects.get(student=student).study_minutes
+        # Cached on the instance since the ORM create
+        old_minutes = student.metrics.study_minutes
 
         # Select different study time option
-        choices = [c[0] for c in DailyStudyTime.choices]
-        if len(choices) < 2:
-            self.skipTest('Not enough DailyStudyTime choices to verify recompute')
-        new_study = choices[1]
+        new_study = DailyStudyTime.M30_60
         patch_payload = {'metrics': {'daily_studying_time': new_study}}
 
         res = self.client.patch(f'{self.BASE_STUDENTS}/{student_id}', patch_payload, format='json')
         payload = json_or_text(res)
 
-        self.assertIn(res.status_code, (status.HTTP_200_OK, status.HTTP_202_ACCEPTED), payload)
+        self.assertIn(res.status_code, OK_OR_ACCEPTED, payload)
 
-        new_minutes = StudentMetrics.objects.get(student=student).study_minutes
+        student.metrics.refresh_from_db()
+        new_minutes = student.metrics.study_minutes
 
         self.assertNotEqual(new_minutes, old_minutes)
 
+    def test_students_patch_writes_only_sent_columns(self):
+        student_id = self._create_student_orm().pk
+
+        with CaptureQueriesContext(connection) as ctx:
+            res = self.client.patch(
+                f'{self.BASE_STUDENTS}/{student_id}',
+                {'weight_kg': 75, 'metrics': {'college_mark': 90}},
+                format='json',
+            )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK, json_or_text(res))
+
+        updates = [q['sql'] for q in ctx.captured_queries if q['sql'].startswith('UPDATE')]
+        self.assertEqual(len(updates), 2)
+
+        # Only the sent columns are written, untouched ones stay out of the UPDATEs
+        self.assertIn('"weight_kg"', updates[0])
+        self.assertNotIn('"height_cm"', updates[0])
+        self.assertIn('"college_mark"', updates[1])
+        self.assertNotIn('"mark_10th"', updates[1])
+        self.assertEqual(StudentMetrics.objects.get().college_mark, 90)
+
     def test_students_delete_returns_204(self):
-        created = self._create_student_via_api()
-        student_id = created.get('id') or created.get('pk')
+        student_id = self._create_student_orm().pk
 
         res = self.client.delete(f'{self.BASE_STUDENTS}/{student_id}')
         # Delete response might not contain any data
-        self.assertIn(res.status_code, (status.HTTP_204_NO_CONTENT, status.HTTP_200_OK), getattr(res, 'data', None))
+        self.assertIn(res.status_code, OK_OR_NO_CONTENT, getattr(res, 'data', None))
 
         self.assertEqual(Student.objects.count(), 0)
         self.assertEqual(StudentMetrics.objects.count(), 0)
 
-    # === DEPARTMENTS CRUD ===
-    def test_departments_crud_create_list_retrieve_update_delete(self):
-        # Create department
-        res = self.client.post(self.BASE_DEPARTMENTS, {'name': 'BCA'}, format='json')
+    # === DEPARTMENTS / HOBBIES CRUD ===
+    def _crud_roundtrip(self, base_url: str, model: type[Department] | type[Hobby], name: str):
+        '''
+        Create -> list -> retrieve -> patch -> delete one named entity (Department and Hobby share the API shape)
+        '''
+        # Create
+        res = self.client.post(base_url, {'name': name}, format='json')
         payload = json_or_text(res)
 
         self.assertEqual(res.status_code, status.HTTP_201_CREATED, payload)
 
-        dept_id = payload.get('id') or payload.get('pk')
+        entity_id = payload.get('id') or payload.get('pk')
 
-        self.assertIsNotNone(dept_id)
+        self.assertIsNotNone(entity_id)
 
-        # Departments list GET
-        res = self.client.get(self.BASE_DEPARTMENTS)
+        # List GET
+        res = self.client.get(base_url)
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
 
-        # Single department GET
-        res = self.client.get(f'{self.BASE_DEPARTMENTS}/{dept_id}')
+        # Single entity GET
+        res = self.client.get(f'{base_url}/{entity_id}')
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
 
-        # Single department PATCH
-        res = self.client.patch(f'{self.BASE_DEPARTMENTS}/{dept_id}', {'name': 'BCA-UPDATED'}, format='json')
+        # Single entity PATCH
+        res = self.client.patch(f'{base_url}/{entity_id}', {'name': f'{name}-UPDATED'}, format='json')
+
+        self.assertIn(res.status_code, OK_OR_ACCEPTED, payload)
+        self.assertTrue(model.objects.filter(id=entity_id, name=f'{name}-UPDATED').exists())
 
-        self.assertIn(res.status_code, (status.HTTP_200_OK, status.HTTP_202_ACCEPTED), payload)
-        self.assertTrue(Department.objects.filter(id=dept_id, name='BCA-UPDATED').exists())
+        # Single entity DELETE
+        res = self.client.delete(f'{base_url}/{entity_id}')
 
-        # Single department DELETE
-        res = self.client.delete(f'{self.BASE_DEPARTMENTS}/{dept_id}')
+        self.assertIn(res.status_code, OK_OR_NO_CONTENT, getattr(res, 'data', None))
+        self.assertFalse(model.objects.filter(id=entity_id).exists())
 
-        self.assertIn(res.status_code, (status.HTTP_204_NO_CONTENT, status.HTTP_200_OK), getattr(res, 'data', None))
-        self.assertFalse(Department.objects.filter(id=dept_id).exists())
+    def test_departments_and_hobbies_crud_create_list_retrieve_update_delete(self):
+        # One test (one transaction), a sub-test per entity type
+        for base_url, model, name in (
+            (self.BASE_DEPARTMENTS, Department, 'BCA'),
+            (self.BASE_HOBBIES, Hobby, 'Gaming'),
+        ):
+            with self.subTest(model=model.__name__):
+                self._crud_roundtrip(base_url, model, name)
 
     def test_departments_delete_blocked_if_referenced(self):
         # Create student record
-        self._create_student_via_api()
+        self._create_student_orm()
 
-        # Try to delete Department referenced by this student
-        res = self.client.delete(f'{self.BASE_DEPARTMENTS}/{self.department.pk}')
+        # Try to delete Department referenced by this student (lookup + EXISTS, no DELETE attempted)
+        with self.assertNumQueries(2):
+            res = self.client.delete(f'{self.BASE_DEPARTMENTS}/{self.department.pk}')
 
         # Allow Err 409 or 400
-        self.assertIn(res.status_code, (status.HTTP_409_CONFLICT, status.HTTP_400_BAD_REQUEST), getattr(res, 'data', None))
+        self.assertIn(res.status_code, CONFLICT_OR_BAD_REQUEST, getattr(res, 'data', None))
         self.assertTrue(Department.objects.filter(id=self.department.pk).exists())
 
-    # === HOBBY CRUD ===
-    def test_hobbies_crud_create_list_retrieve_update_delete(self):
-        # Create hobby
-        res = self.client.post(self.BASE_HOBBIES, {'name': 'Gaming'}, format='json')
-        payload = json_or_text(res)
-
-        self.assertEqual(res.status_code, status.HTTP_201_CREATED, payload)
-
-        hobby_id = payload.get('id') or payload.get('pk')
-
-        self.assertIsNotNone(hobby_id)
-
-        # Hobbies list GET
-        res = self.client.get(self.BASE_HOBBIES)
-        self.assertEqual(res.status_code, status.HTTP_200_OK)
-
-        # Single hobby GET
-        res = self.client.get(f'{self.BASE_HOBBIES}/{hobby_id}')
-        self.assertEqual(res.status_code, status.HTTP_200_OK)
-
-        # Single hobby PATCH
-        res = self.client.patch(f'{self.BASE_HOBBIES}/{hobby_id}', {'name': 'Gaming-UPDATED'}, format='json')
-
-        self.assertIn(res.status_code, (status.HTTP_200_OK, status.HTTP_202_ACCEPTED), payload)
-        self.assertTrue(Hobby.objects.filter(id=hobby_id, name='Gaming-UPDATED').exists())
-
-        # Single hobby DELETE
-        res = self.client.delete(f'{self.BASE_HOBBIES}/{hobby_id}')
-
-        self.assertIn(res.status_code, (status.HTTP_204_NO_CONTENT, status.HTTP_200_OK), getattr(res, 'data', None))
-        self.assertFalse(Hobby.objects.filter(id=hobby_id).exists())
-
     def test_hobbies_delete_blocked_if_referenced(self):
         # Create student
-        self._create_student_via_api()
+        self._create_student_orm()
 
         # Try to delete Hobby referenced by this student
         res = self.client.delete(f'{self.BASE_HOBBIES}/{self.hobby.pk}')
 
         # Allow Err 409 or 400
-        self.assertIn(res.status_code, (status.HTTP_409_CONFLICT, status.HTTP_400_BAD_REQUEST), getattr(res, 'data', None))
+        self.assertIn(res.status_code, CONFLICT_OR_BAD_REQUEST, getattr(res, 'data', None))
         self.assertTrue(Hobby.objects.filter(id=self.hobby.pk).exists())
\ No newline at end of file
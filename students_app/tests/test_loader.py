@@ -1,10 +1,16 @@
 from django.test import TestCase
 from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from functools import lru_cache
 from pathlib import Path
+from unittest import mock
 import csv
+import io
 import tempfile
 
 from students_app.models import Department, Hobby, Student, StudentMetrics
+from students_app.management.commands.load_students import resolve_name_ids
 from students_app.contstants import (
     DAILY_STUDY_TIME_MAP,
     MEDIA_VIDEO_TIME_MAP,
@@ -15,21 +21,38 @@ from students_app.contstants import (
     FINANCIAL_STATUS_MAP,
 )
 
-def make_dummy_CSV(dept_name='CSE', hobby_name='Reading'):
+# Valid raw values, picked from the maps once
+GENDER_RAW = next(iter(GENDER_MAP.keys()))
+PREF_RAW = next(iter(STUDY_PREFERENCE_MAP.keys()))
+STUDY_RAW = next(iter(DAILY_STUDY_TIME_MAP.keys()))
+MEDIA_RAW = next(iter(MEDIA_VIDEO_TIME_MAP.keys()))
+TRAVEL_RAW = next(iter(TRAVELING_TIME_MAP.keys()))
+STRESS_RAW = next(iter(STRESS_LEVEL_MAP.keys()))
+FIN_RAW = next(iter(FINANCIAL_STATUS_MAP.keys()))
+
+def make_dummy_CSV(dept_name='CSE', hobby_name='Reading', rows=1):
     '''
-    Create dummy CSV file with one row and return path to it
+    Create dummy CSV file with `rows` identical rows and return path to it
     '''
-    # Pick valid values from the maps
-    gender_raw = next(iter(GENDER_MAP.keys()))
-    pref_raw = next(iter(STUDY_PREFERENCE_MAP.keys()))
-    study_raw = next(iter(DAILY_STUDY_TIME_MAP.keys()))
-    media_raw = next(iter(MEDIA_VIDEO_TIME_MAP.keys()))
-    travel_raw = next(iter(TRAVELING_TIME_MAP.keys()))
-    stress_raw = next(iter(STRESS_LEVEL_MAP.keys()))
-    fin_raw = next(iter(FINANCIAL_STATUS_MAP.keys()))
+    # Positional call, so defaults and keyword calls share one cache entry
+    return _write_dummy_CSV(dept_name, hobby_name, rows)
+
+# Content depends only on the names and the loader never modifies the file, so each pair is written once per run
+@lru_cache(maxsize=None)
+def _write_dummy_CSV(dept_name, hobby_name, rows):
+    # Create test CSV file and write our dummy data
+    tmp = tempfile.NamedTemporaryFile(mode='w', newline='', suffix='.csv', delete=False)
 
-    # Dummy data (header and one row)
+    with tmp:
+        tmp.write(dummy_CSV_text(dept_name, hobby_name, rows))
+
+    return tmp.name
 
+@lru_cache(maxsize=None)
+def dummy_CSV_text(dept_name='CSE', hobby_name='Reading', rows=1):
+    '''
+    Dummy CSV content (header and `rows` identical rows) as a string
+    '''
     header = [
         'Certification Course', 'Gender', 'Department', 'Height(CM)', 'Weight(KG)',
         '10th Mark', '12th Mark', 'college mark', 'hobbies',
@@ -39,22 +62,19 @@ def make_dummy_CSV(dept_name='CSE', hobby_name='Reading'):
     ]
 
     row = [
-        'Yes', gender_raw, dept_name, '170', '68.9',
+        'Yes', GENDER_RAW, dept_name, '170', '68.9',
         '80', '85', '78', hobby_name,
-        study_raw, pref_raw, '50000',
+        STUDY_RAW, PREF_RAW, '50000',
         'Yes', '70%',
-        media_raw, travel_raw, stress_raw, fin_raw, 'No'
+        MEDIA_RAW, TRAVEL_RAW, STRESS_RAW, FIN_RAW, 'No'
     ]
 
-    # Create test CSV file and write our dummy data
-    tmp = tempfile.NamedTemporaryFile(mode='w', newline='', suffix='.csv', delete=False)
+    buf = io.StringIO(newline='')
+    w = csv.writer(buf)
+    w.writerow(header)
+    w.writerows([row] * rows)
 
-    with tmp:
-        w = csv.writer(tmp)
-        w.writerow(header)
-        w.writerow(row)
-
-    return tmp.name
+    return buf.getvalue()
 
 class LoaderTests(TestCase):
     def test_loader_creates_students_and_metrics(self):
@@ -72,6 +92,49 @@ class LoaderTests(TestCase):
         # Check that student and metrics loadded correctly
         self.assertGreater(Student.objects.count(), 0)
         self.assertEqual(Student.objects.count(), StudentMetrics.objects.count())
+        # bulk_create skips save(), so loader has to fill denormalized names itself
+        self.assertEqual(Student.objects.get().department_name, 'CSE')
+
+    def test_loader_with_worker_processes(self):
+        '''
+        Test that parsing in a process pool gives the same result
+        '''
+        csv_path = make_dummy_CSV()
+
+        call_command('load_students', csv_path, '--truncate', '--workers', '2')
+
+        self.assertEqual(Student.objects.count(), 1)
+        self.assertEqual(StudentMetrics.objects.count(), 1)
+        self.assertEqual(StudentMetrics.objects.get().salary_expectation, 50000)
+
+    def test_loader_reads_stdin(self):
+        '''
+        `-` reads the CSV from stdin, no file on disk needed (BOM included, like an Excel export)
+        '''
+        stdin = io.StringIO('\ufeff' + dummy_CSV_text(rows=3))
+
+        with mock.patch('sys.stdin', stdin):
+            call_command('load_students', '-', '--truncate', stdout=io.StringIO())
+
+        self.assertEqual(Student.objects.count(), 3)
+        self.assertEqual(StudentMetrics.objects.count(), 3)
+        self.assertEqual(Student.objects.first().hobby_name, 'Reading')
+
+    def test_loader_inserts_in_batches(self):
+        '''
+        Rows are inserted with bulk INSERTs, not one query per row
+        '''
+        csv_path = make_dummy_CSV(rows=20)
+
+        with CaptureQueriesContext(connection) as ctx:
+            call_command('load_students', csv_path, '--batch-size', '50')
+
+        self.assertEqual(Student.objects.count(), 20)
+
+        inserts = [q['sql'] for q in ctx.captured_queries if q['sql'].startswith('INSERT')]
+
+        # One INSERT per table: department, hobby, student, metrics
+        self.assertEqual(len(inserts), 4, inserts)
 
 
 
@@ -102,4 +165,48 @@ class LoaderTruncateTests(TestCase):
         self.assertFalse(Department.objects.filter(name='CSE').exists())
         self.assertFalse(Hobby.objects.filter(name='Reading').exists())
         self.assertTrue(Department.objects.filter(name='EEE').exists())
-        self.assertTrue(Hobby.objects.filter(name='Gaming').exists())
\ No newline at end of file
+        self.assertTrue(Hobby.objects.filter(name='Gaming').exists())
+
+    def test_truncate_bulk_deletes_and_invalidates_once(self):
+        call_command('load_students', make_dummy_CSV(rows=20), '--batch-size', '50')
+
+        with self.captureOnCommitCallbacks() as callbacks, CaptureQueriesContext(connection) as ctx:
+            call_command('load_students', make_dummy_CSV(), '--truncate')
+
+        deletes = [q['sql'] for q in ctx.captured_queries if q['sql'].startswith('DELETE')]
+
+        # One version bump for the whole load (not one per deleted row), DELETEs don't grow with the row count
+        self.assertEqual(len(callbacks), 1)
+        self.assertLessEqual(len(deletes), 5, deletes)
+        self.assertEqual(Student.objects.count(), 1)
+
+    def test_truncate_with_header_only_csv_still_invalidates(self):
+        call_command('load_students', make_dummy_CSV(rows=3), '--batch-size', '50')
+
+        # Header only: nothing to load, but the truncate alone has to move the data version
+        header_only = tempfile.NamedTemporaryFile(mode='w', newline='', suffix='.csv', delete=False)
+        self.addCleanup(Path(header_only.name).unlink)
+
+        with header_only:
+            header_only.write(dummy_CSV_text(rows=0))
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            call_command('load_students', header_only.name, '--truncate', stdout=io.StringIO())
+
+        self.assertEqual(Student.objects.count(), 0)
+        self.assertEqual([cb.__name__ for cb in callbacks], ['bump_data_version'])
+
+    def test_resolve_name_ids_inserts_only_missing(self):
+        '''
+        Known names are a single SELECT, new ones are inserted in one go
+        '''
+        cse = Department.objects.create(name='CSE')
+
+        with self.assertNumQueries(1):
+            self.assertEqual(resolve_name_ids(Department, {'CSE'}, 100), {'CSE': cse.pk})
+
+        # SELECT known + INSERT missing + SELECT new ids
+        with self.assertNumQueries(3):
+            ids = resolve_name_ids(Department, {'CSE', 'BCA', 'EEE'}, 100)
+
+        self.assertEqual(ids, dict(Department.objects.values_list('name', 'id')))
@@ -12,16 +12,18 @@ from students_app.contstants import (
 )
 
 class ModelProtectTests(TestCase):
-    def setUp(self):
-        self.dept = Department.objects.create(name='CSE')
-        self.hobby = Hobby.objects.create(name='Reading')
+    @classmethod
+    def setUpTestData(cls):
+        # Created once per class, every test gets its own copies (rolled back in between)
+        cls.dept = Department.objects.create(name='CSE')
+        cls.hobby = Hobby.objects.create(name='Reading')
 
-        self.student = Student.objects.create(
+        cls.student = Student.objects.create(
             gender=Gender.MALE,
-            department=self.dept,
+            department=cls.dept,
             height_cm=170,
             weight_kg=70,
-            hobby=self.hobby,
+            hobby=cls.hobby,
         )
 
     def test_department_delete_is_protected(self):
@@ -48,16 +50,18 @@ class ModelProtectTests(TestCase):
 
 
 class ModelRelationshipTests(TestCase):
-    def test_cascade_delete_student_deletes_metrics(self):
-        dept = Department.objects.create(name='CSE')
-        hobby = Hobby.objects.create(name='Reading')
+    @classmethod
+    def setUpTestData(cls):
+        cls.dept = Department.objects.create(name='CSE')
+        cls.hobby = Hobby.objects.create(name='Reading')
 
+    def test_cascade_delete_student_deletes_metrics(self):
         student = Student.objects.create(
             gender=Gender.MALE,
-            department=dept,
+            department=self.dept,
             height_cm=170,
             weight_kg=70,
-            hobby=hobby,
+            hobby=self.hobby,
         )
 
         StudentMetrics.objects.create(
@@ -85,7 +89,51 @@ class ModelRelationshipTests(TestCase):
         self.assertEqual(Student.objects.count(), 1)
         self.assertEqual(StudentMetrics.objects.count(), 1)
 
-        student.delete()
+        # Fetch metrics (post_delete receivers need the objects) + DELETE metrics + DELETE student
+        with self.assertNumQueries(3):
+            student.delete()
 
         self.assertEqual(Student.objects.count(), 0)
-        self.assertEqual(StudentMetrics.objects.count(), 0)
\ No newline at end of file
+        self.assertEqual(StudentMetrics.objects.count(), 0)
+
+
+class ModelDenormalizedNamesTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.dept = Department.objects.create(name='CSE')
+        cls.hobby = Hobby.objects.create(name='Reading')
+
+        cls.student = Student.objects.create(
+            gender=Gender.MALE,
+            department=cls.dept,
+            height_cm=170,
+            weight_kg=70,
+            hobby=cls.hobby,
+        )
+
+    def test_names_are_set_on_save(self):
+        self.assertEqual(self.student.department_name, 'CSE')
+        self.assertEqual(self.student.hobby_name, 'Reading')
+
+    def test_rename_updates_students(self):
+        self.dept.name = 'Computer Science'
+        self.dept.save()
+        self.hobby.name = 'Chess'
+        self.hobby.save()
+
+        self.student.refresh_from_db()
+        self.assertEqual(self.student.department_name, 'Computer Science')
+        self.assertEqual(self.student.hobby_name, 'Chess')
+
+    def test_bmi_x100_for_tall_student(self):
+        # height^2 above the smallint range (182 cm and up) still computes
+        student = Student.objects.create(
+            gender=Gender.MALE,
+            department=self.dept,
+            height_cm=250,
+            weight_kg=300,
+            hobby=self.hobby,
+        )
+
+        student.refresh_from_db()
+        self.assertEqual(student.bmi_x100, 300 * 1_000_000 // (250 * 250))
@@ -0,0 +1,54 @@
+from django.test import TestCase
+from django.core.management import call_command
+
+from students_app.models import Student, StudentMetrics, Department, Hobby
+from students_app.serializers import DAILY_STUDY_MINUTES, MEDIA_VIDEO_MINUTES, TRAVELING_MINUTES
+from students_app.contstants import (
+    DailyStudyTime,
+    MediaVideoTime,
+    TravelingTime,
+    StudyPreference,
+    StressLevel,
+    FinancialStatus,
+)
+
+
+
+class RecomputeMinutesCommandTests(TestCase):
+    def test_recompute_fixes_stale_minutes(self):
+        student = Student.objects.create(
+            gender='Male',
+            department=Department.objects.create(name='CSE'),
+            hobby=Hobby.objects.create(name='Reading'),
+            height_cm=170,
+            weight_kg=70,
+        )
+
+        # Minutes deliberately out of sync with the enum columns
+        StudentMetrics.objects.create(
+            student=student,
+            mark_10th=80,
+            mark_12th=80,
+            college_mark=70,
+            daily_studying_time=DailyStudyTime.H2_3,
+            prefer_to_study_in=StudyPreference.MORNING,
+            salary_expectation=1000,
+            willingness_percent=50,
+            social_media_video=MediaVideoTime.M30_60,
+            travelling_time=TravelingTime.GT3H,
+            stress_level=StressLevel.GOOD,
+            financial_status=FinancialStatus.GOOD,
+            study_minutes=0,
+            social_minutes=0,
+            travel_minutes=0,
+        )
+
+        # Single UPDATE for all three columns (+ cache version bump, not a DB query)
+        with self.assertNumQueries(1):
+            call_command('recompute_metric_minutes')
+
+        metrics = StudentMetrics.objects.get()
+
+        self.assertEqual(metrics.study_minutes, DAILY_STUDY_MINUTES[DailyStudyTime.H2_3])
+        self.assertEqual(metrics.social_minutes, MEDIA_VIDEO_MINUTES[MediaVideoTime.M30_60])
+        self.assertEqual(metrics.travel_minutes, TRAVELING_MINUTES[TravelingTime.GT3H])
@@ -0,0 +1,52 @@
+from decimal import Decimal
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils.translation import gettext_lazy
+from rest_framework.renderers import JSONRenderer
+import json
+
+from students_app.renderers import ORJSONRenderer
+from students_app.tests import LOCMEM_CACHES
+
+
+
+class ORJSONRendererTests(SimpleTestCase):
+    def test_render_matches_stdlib_json(self):
+        data = {'name': 'CSE', 'marks': [80, 85.5], 'part_time': None, 1: 'int key'}
+
+        self.assertEqual(json.loads(ORJSONRenderer().render(data)), json.loads(json.dumps(data)))
+
+    def test_render_escapes_js_line_separators_like_drf(self):
+        data = {'name': 'Caf\u00e9\u2028line\u2029para', 'mark': 72.5, 'hobby': None}
+
+        rendered = ORJSONRenderer().render(data)
+
+        # Byte for byte what DRF sends, separators escaped and other non-ASCII kept as UTF-8
+        self.assertEqual(rendered, JSONRenderer().render(data))
+        self.assertIn(b'\\u2028', rendered)
+        self.assertIn(b'\\u2029', rendered)
+
+    def test_render_writes_non_finite_floats_as_null(self):
+        # Documented difference: DRF's strict JSON raises on these
+        data = {'avg': float('nan'), 'max': float('inf')}
+
+        self.assertEqual(json.loads(ORJSONRenderer().render(data)), {'avg': None, 'max': None})
+
+        with self.assertRaises(ValueError):
+            JSONRenderer().render(data)
+
+    def test_render_falls_back_to_drf_encoder(self):
+        # Types orjson doesn't serialize natively (DRF's encoder turns them into float / str)
+        rendered = ORJSONRenderer().render({'avg': Decimal('72.5'), 'detail': gettext_lazy('Not found.')})
+
+        self.assertEqual(json.loads(rendered), {'avg': 72.5, 'detail': 'Not found.'})
+
+
+
+# DRF views touch the DB (utility endpoints skip DRF), so this one needs TestCase
+@override_settings(CACHES=LOCMEM_CACHES)
+class BrowsableAPITests(TestCase):
+    def test_browsable_api_still_renders(self):
+        res = self.client.get('/api/departments', HTTP_ACCEPT='text/html')
+
+        self.assertEqual(res.status_code, 200)
+        self.assertIn('text/html', res['Content-Type'])
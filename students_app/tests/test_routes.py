@@ -1,9 +1,14 @@
-from django.test import TestCase
+from django.test import RequestFactory, SimpleTestCase
 from django.urls import reverse
+import json
 
+from students_app.middleware import HealthCheckMiddleware
+from students_app.views import _admin_block, _admin_creds, _read_requirements
 
 
-class HomeRouteTests(TestCase):
+
+# No DB access in these routes, SimpleTestCase skips the per-test transaction (and fails on any query)
+class HomeRouteTests(SimpleTestCase):
     def test_home_returns_required_metadata_and_endpoints(self):
         res = self.client.get(reverse('home'))
 
@@ -34,13 +39,7 @@ class HomeRouteTests(TestCase):
         self.assertIsInstance(data['admin'], dict)
         self.assertIn('url', data['admin'])
 
-    def test_home_includes_analytics_links(self):
-        res = self.client.get(reverse('home'))
-
-        self.assertEqual(res.status_code, 200)
-
-        endpoints = res.json()['endpoints']
-
+        # Analytics routes are linked too (same response, no second request)
         self.assertIn('students_search', endpoints)
         self.assertIn('departments_summary', endpoints)
         self.assertIn('parttime_impact', endpoints)
@@ -48,9 +47,57 @@ class HomeRouteTests(TestCase):
         self.assertIn('risk_list', endpoints)
         self.assertIn('bmi_distribution', endpoints)
 
+    def test_home_reports_pagination_per_list_endpoint(self):
+        pagination = self.client.get(reverse('home')).json()['pagination']
+
+        self.assertEqual(pagination['students']['pagination_class'], 'students_app.pagination.StudentCursorPagination')
+        self.assertEqual(pagination['departments']['pagination_class'], 'rest_framework.pagination.PageNumberPagination')
+        self.assertEqual(pagination['hobbies']['page_size'], pagination['students']['page_size'])
+
+    def _get_home(self, show_admin_creds: bool):
+        # Admin settings are read once per process, so drop the cached values around the override
+        _admin_creds.cache_clear()
+        _admin_block.cache_clear()
+        self.addCleanup(_admin_block.cache_clear)
+        self.addCleanup(_admin_creds.cache_clear)
+
+        with self.settings(SHOW_ADMIN_CREDS=show_admin_creds):
+            return self.client.get(reverse('home'))
+
+    def test_home_is_cacheable_per_host(self):
+        res = self._get_home(show_admin_creds=False)
+
+        self.assertNotIn('password', res.json()['admin'])
+        self.assertIn('public', res['Cache-Control'])
+        self.assertIn('max-age=300', res['Cache-Control'])
+        self.assertIn('Host', res['Vary'])
+
+        # Repeat poll with the ETag gets an empty 304
+        with self.settings(SHOW_ADMIN_CREDS=False):
+            res = self.client.get(reverse('home'), HTTP_IF_NONE_MATCH=res['ETag'])
+
+        self.assertEqual(res.status_code, 304)
+
+    def test_home_with_admin_creds_is_never_stored_by_shared_caches(self):
+        res = self._get_home(show_admin_creds=True)
 
+        self.assertIn('password', res.json()['admin'])
+        self.assertIn('private', res['Cache-Control'])
+        self.assertIn('no-store', res['Cache-Control'])
+        self.assertNotIn('public', res['Cache-Control'])
 
-class HealthEndpointTests(TestCase):
+    def test_home_packages_are_parsed_once(self):
+        # Same cached tuple on every call, and that's what the home page lists
+        self.assertIs(_read_requirements(), _read_requirements())
+        self.assertIn('Django', ' '.join(_read_requirements()))
+
+        res = self.client.get(reverse('home'))
+
+        self.assertEqual(res.json()['packages'], list(_read_requirements()))
+
+
+
+class HealthEndpointTests(SimpleTestCase):
     def test_health_ok(self):
         res = self.client.get(reverse('health'))
 
@@ -60,4 +107,22 @@ class HealthEndpointTests(TestCase):
 
         self.assertEqual(data.get('status'), 'ok')
         self.assertIn('service', data)
-        self.assertIn('api_version', data)
\ No newline at end of file
+        self.assertIn('api_version', data)
+
+    def test_health_conditional_get(self):
+        etag = self.client.get(reverse('health'))['ETag']
+        res = self.client.get(reverse('health'), HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, 304)
+        self.assertEqual(res.content, b'')
+
+    def test_health_answered_by_middleware(self):
+        # Whatever comes after the middleware (other middleware, URL resolution, views) is never reached
+        def unreachable(request):
+            raise AssertionError('health probe reached the rest of the stack')
+
+        middleware = HealthCheckMiddleware(unreachable)
+        res = middleware(RequestFactory().get(reverse('health')))
+
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(json.loads(res.content)['status'], 'ok')
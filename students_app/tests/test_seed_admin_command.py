@@ -1,9 +1,20 @@
 from django.test import TestCase, override_settings
 from django.contrib.auth import get_user_model
-from django.core.management import call_command
+from django.contrib.auth.hashers import make_password
 
+from students_app.management.commands.seed_admin import Command as SeedAdminCommand
 
 
+def seed_admin():
+    '''
+    Run the command w/o call_command(): it takes no arguments, so there is nothing to parse
+    '''
+    SeedAdminCommand().handle()
+
+
+
+# Fast hasher for tests (PBKDF2 would dominate the runtime), hashing/checking logic stays the same
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
 class SeedAdminCommandTests(TestCase):
     @override_settings(
         ADMIN_USERNAME='admin_test',
@@ -16,7 +27,7 @@ class SeedAdminCommandTests(TestCase):
         self.assertFalse(User.objects.filter(username='admin_test').exists())
 
         # Create a super user with admin pre-requisites
-        call_command('seed_admin')
+        seed_admin()
 
         user = User.objects.get(username='admin_test')
 
@@ -36,11 +47,32 @@ class SeedAdminCommandTests(TestCase):
         User = get_user_model()
 
         # Create different super user
-        call_command('seed_admin')
+        seed_admin()
+
+        self.assertEqual(User.objects.filter(username='admin_test2').count(), 1)
+
+        # Check that command doesnt duplicate users (existing user costs a single SELECT)
+        with self.assertNumQueries(1):
+            seed_admin()
 
         self.assertEqual(User.objects.filter(username='admin_test2').count(), 1)
 
-        # Check that command doesnt duplicate users
-        call_command('seed_admin')
 
-        self.assertEqual(User.objects.filter(username='admin_test2').count(), 1)
\ No newline at end of file
+
+    @override_settings(
+        ADMIN_USERNAME='admin_test3',
+        ADMIN_EMAIL='admin_test3@example.com',
+    )
+    def test_seed_admin_accepts_prehashed_password(self):
+        User = get_user_model()
+
+        # Hashed inside the test, so the test hasher is used
+        with self.settings(ADMIN_PASSWORD=make_password('admin123_test3')):
+            seed_admin()
+
+        user = User.objects.get(username='admin_test3')
+
+        # Hash is stored as is (not hashed again)
+        self.assertTrue(user.is_superuser)
+        self.assertTrue(user.is_staff)
+        self.assertTrue(user.check_password('admin123_test3'))
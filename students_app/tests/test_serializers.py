@@ -2,7 +2,12 @@ from django.test import TestCase
 from typing import cast
 
 from students_app.models import Student, StudentMetrics, Department, Hobby
-from students_app.serializers import StudentWriteSerializer
+from students_app.serializers import (
+    StudentWriteSerializer,
+    StudentReadSerializer,
+    StudentMetricsWriteSerializer,
+    CachedFieldsModelSerializer,
+)
 from students_app.contstants import (
     DailyStudyTime, 
     MediaVideoTime, 
@@ -12,53 +17,53 @@ from students_app.contstants import (
     FinancialStatus,
 )
 
-class StudentSerializerTests(TestCase):
-    def setUp(self):
-        # Create dummy department and hobby
-        self.department = Department.objects.create(name='CSE')
-        self.hobby = Hobby.objects.create(name='Reading')
+# Payload template (FK ids are filled per test), any valid enum members will do
+STUDENT_PAYLOAD = {
+    'gender': 'Male',
+    'height_cm': 170,
+    'weight_kg': 69,
+    'metrics': {
+        'certification_course': True,
+        'mark_10th': 80,
+        'mark_12th': 85,
+        'college_mark': 78,
 
-    def generate_json_payload(self):
-        # Just pick enum values
-        daily_study = DailyStudyTime.choices[0][0]
-        media = MediaVideoTime.choices[0][0]
-        travel = TravelingTime.choices[0][0]
-        pref = StudyPreference.choices[0][0]
-        stress = StressLevel.choices[0][0]
-        fin = FinancialStatus.choices[0][0]
+        'daily_studying_time': DailyStudyTime.M0_30,
+        'prefer_to_study_in': StudyPreference.MORNING,
 
-        return {
-            'gender': 'Male',
-            'department': self.department.pk,
-            'hobby': self.hobby.pk,
-            'height_cm': 170,
-            'weight_kg': 69,
-            'metrics': {
-                'certification_course': True,
-                'mark_10th': 80,
-                'mark_12th': 85,
-                'college_mark': 78,
+        'salary_expectation': 50000,
+        'likes_degree': True,
+        'part_time_job': False,
+        'financial_status': FinancialStatus.AWFUL,
 
-                'daily_studying_time': daily_study,
-                'prefer_to_study_in': pref,
+        'willingness_percent': 70,
 
-                'salary_expectation': 50000,
-                'likes_degree': True,
-                'part_time_job': False,
-                'financial_status': fin,
+        'social_media_video': MediaVideoTime.M0,
+        'travelling_time': TravelingTime.M0_30,
 
-                'willingness_percent': 70,
+        'stress_level': StressLevel.GOOD,
 
-                'social_media_video': media,
-                'travelling_time': travel,
+        # Try to pass some minutes manually, but this shouldnt end up in the resulted row
+        'study_minutes': 999,
+        'social_minutes': 999,
+        'travel_minutes': 999,
+    },
+}
 
-                'stress_level': stress,
+class StudentSerializerTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        # Create dummy department and hobby (once per class)
+        cls.department = Department.objects.create(name='CSE')
+        cls.hobby = Hobby.objects.create(name='Reading')
 
-                # Try to pass some minutes manually, but this shouldnt end up in the resulted row
-                'study_minutes': 999,
-                'social_minutes': 999,
-                'travel_minutes': 999,
-            },
+    def generate_json_payload(self):
+        # Fresh copy per call (tests mutate it), metrics too
+        return {
+            **STUDENT_PAYLOAD,
+            'department': self.department.pk,
+            'hobby': self.hobby.pk,
+            'metrics': dict(STUDENT_PAYLOAD['metrics']),
         }
 
 
@@ -71,7 +76,8 @@ class StudentSerializerTests(TestCase):
 
         student =  cast(Student, ser.save())
         
-        metrics = StudentMetrics.objects.get(student=student)
+        # Reverse one-to-one is cached on create, no extra SELECT
+        metrics = student.metrics
 
         self.assertEqual(Student.objects.count(), 1)
         self.assertEqual(StudentMetrics.objects.count(), 1)
@@ -84,6 +90,63 @@ class StudentSerializerTests(TestCase):
 
 
 
+    def test_many_create_uses_bulk_inserts(self):
+        ser = StudentWriteSerializer(data=[self.generate_json_payload() for _ in range(3)], many=True)
+
+        # Same department/hobby ids in every item are resolved once each
+        with self.assertNumQueries(2):
+            self.assertTrue(ser.is_valid(), ser.errors)
+
+        # Savepoint pair + one INSERT for students + one for metrics (validation lookups happen in is_valid)
+        with self.assertNumQueries(4):
+            students = ser.save()
+
+        self.assertEqual(Student.objects.count(), 3)
+        self.assertEqual(StudentMetrics.objects.count(), 3)
+
+        # Derived fields are set even without save()
+        student = Student.objects.get(pk=students[0].pk)
+        self.assertEqual(student.department_name, 'CSE')
+        self.assertEqual(student.bmi_x100, 2387)
+        self.assertEqual(student.metrics.study_minutes, 15)
+
+    def test_read_serializer_fields_are_cached_but_not_shared(self):
+        first = StudentReadSerializer().fields
+        second = StudentReadSerializer().fields
+
+        # Same field set, but every instance owns (and binds) its own copies
+        self.assertEqual(list(first), list(second))
+        self.assertIsNot(first['metrics'], second['metrics'])
+        self.assertIs(second['metrics'].parent.__class__, StudentReadSerializer)
+
+    def test_write_serializer_fields_are_cached_but_not_shared(self):
+        first = StudentWriteSerializer().fields
+        second = StudentWriteSerializer().fields
+
+        # Related field caches are per instance too (a copy never sees another request's objects)
+        first['department'].to_internal_value(self.department.pk)
+
+        self.assertEqual(list(first), list(second))
+        self.assertIsNot(first['department'], second['department'])
+        self.assertEqual(second['department']._resolved, {})
+        self.assertIsNot(first['metrics'], second['metrics'])
+
+    def test_fields_cache_is_warm_after_app_ready(self):
+        # Filled in AppConfig.ready(), before any test created a serializer
+        self.assertIn(StudentWriteSerializer, CachedFieldsModelSerializer._fields_cache)
+        self.assertIn(StudentMetricsWriteSerializer, CachedFieldsModelSerializer._fields_cache)
+
+    def test_read_columns_follow_serializer_fields(self):
+        columns = StudentReadSerializer.read_columns()
+
+        # Own fields as is, nested ones through their relation (so .only() never drops an output field)
+        self.assertIn('gender', columns)
+        self.assertIn('department__name', columns)
+        self.assertIn('hobby__name', columns)
+        self.assertIn('metrics__stress_level', columns)
+        self.assertNotIn('department', columns)
+        self.assertNotIn('created_at', columns)
+
     def test_minutes_are_derived_not_accepted(self):
         data = self.generate_json_payload()
         ser = StudentWriteSerializer(data=data)
@@ -91,7 +154,7 @@ class StudentSerializerTests(TestCase):
         self.assertTrue(ser.is_valid(), ser.errors)
 
         student = ser.save()
-        metrics = StudentMetrics.objects.get(student=student)
+        metrics = student.metrics
 
         # Client sent 999, but it shouldnt be stored
         self.assertNotEqual(metrics.study_minutes, 999)
@@ -111,17 +174,12 @@ class StudentSerializerTests(TestCase):
         self.assertTrue(ser.is_valid(), ser.errors)
 
         student = ser.save()
-        metrics = StudentMetrics.objects.get(student=student)
+        metrics = student.metrics
 
         old_minutes = metrics.study_minutes
 
-        # Get a list of egliable options
-        choices = [c[0] for c in DailyStudyTime.choices]
-
-        if len(choices) < 2:
-            self.skipTest('Not enough DailyStudyTime choices to recompute')
-
-        new_study = choices[1]
+        # Pick a different study time option
+        new_study = DailyStudyTime.M30_60
 
         update_data = {
             'department': self.department.pk,
@@ -135,7 +193,9 @@ class StudentSerializerTests(TestCase):
         self.assertTrue(ser2.is_valid(), ser2.errors)
 
         student2 = ser2.save()
-        metrics2 = StudentMetrics.objects.get(student=student2)
+        # Re-read the row, the cached object would just echo what update() set on it
+        metrics2 = student2.metrics
+        metrics2.refresh_from_db()
 
         self.assertNotEqual(metrics2.study_minutes, old_minutes)
 
@@ -1,51 +1,80 @@
 from django.conf import settings
+from django.db import IntegrityError, transaction
 from django.db.models import ProtectedError
-from django import get_version as get_django_version
+from django.http import HttpResponse, StreamingHttpResponse
 from django.shortcuts import render
+from django.utils.cache import patch_cache_control
+from django.utils.decorators import method_decorator
+from django.views.decorators.http import condition, conditional_page, require_safe
+from django.views.decorators.vary import vary_on_headers
 from rest_framework import generics, status
-from rest_framework.decorators import api_view
 from rest_framework.response import Response
-from platform import python_version as get_python_version
+from functools import lru_cache
+from itertools import batched
+import hashlib
 from pathlib import Path
+import orjson
 
+from students_app.cache import data_version_etag
 from students_app.models import Student, Department, Hobby
-from students_app.serializers import StudentReadSerializer, StudentWriteSerializer, DepartmentSerializer, HobbySerializer
+from students_app.pagination import StudentCursorPagination
+from students_app.serializers import (
+    StudentReadSerializer,
+    StudentWriteSerializer,
+    DepartmentSerializer,
+    HobbySerializer,
+    STUDENT_LIST_VALUES,
+    student_list_rows,
+)
 
 # Helper functions
-def _read_requirements() -> list[str]:
+@lru_cache(maxsize=1)
+def _read_requirements() -> tuple[str, ...]:
     '''
     Reads requirements.txt from BASE_DIR. Used to show in home page.
+    Parsed once per process (file only changes on deploy), tuple so the cached value can't be mutated
     '''
     try:
         req_path = Path(settings.BASE_DIR) / 'requirements.txt'
 
         if req_path.exists():
-            return [
-                line.strip()
-                for line in req_path.read_text(encoding='utf-8').splitlines()
-                if line.strip() and not line.strip().startswith('#')
-            ]
+            lines = (line.strip() for line in req_path.read_text(encoding='utf-8').splitlines())
+
+            return tuple(line for line in lines if line and not line.startswith('#'))
     except Exception:
         pass
 
-    return []
+    return ()
 
-def _admin_block(base: str) -> dict:
+def _requirements() -> tuple[str, ...]:
     '''
-    Show admin credentials only when SHOW_ADMIN_CREDS is enabled (for local debug)
+    Cached requirements, re-read on every call in DEBUG so local edits show up without a restart
     '''
-    block = {'url': f'{base}/admin/'}
+    if settings.DEBUG:
+        return _read_requirements.__wrapped__()
 
-    show = getattr(settings, 'SHOW_ADMIN_CREDS', False)
+    return _read_requirements()
 
-    if show:
-        block.update(
-            {
-                'username': getattr(settings, 'ADMIN_USERNAME', 'NOT_SET'),
-                'password': getattr(settings, 'ADMIN_PASSWORD', 'NOT_SET'),
-            }
-        )
-    return block
+@lru_cache(maxsize=1)
+def _admin_creds() -> dict:
+    '''
+    Admin credentials to show, empty unless SHOW_ADMIN_CREDS is enabled (settings are fixed per process, read once)
+    '''
+    if not getattr(settings, 'SHOW_ADMIN_CREDS', False):
+        return {}
+
+    return {
+        'username': getattr(settings, 'ADMIN_USERNAME', 'NOT_SET'),
+        'password': getattr(settings, 'ADMIN_PASSWORD', 'NOT_SET'),
+    }
+
+@lru_cache(maxsize=16)
+def _admin_block(base: str) -> dict:
+    '''
+    Show admin credentials only when SHOW_ADMIN_CREDS is enabled (for local debug).
+    Built once per host (like _home_links), returned dict is shared
+    '''
+    return {'url': f'{base}/admin/', **_admin_creds()}
 
 
 
@@ -58,87 +87,205 @@ def homepage(request):
 
 
 # === UTILITY ENDPOINTS ===
-@api_view(['GET'])
+# Discovery links (name -> path), only the base URL differs between requests
+HOME_ENDPOINT_PATHS = (
+    # Utility
+    ('health', '/api/health/'),
+
+    # CRUD endpoints
+    ('students', '/api/students'),
+    ('student_detail', '/api/students/<pk>'),
+    ('departments', '/api/departments'),
+    ('department_detail', '/api/departments/<pk>'),
+    ('hobbies', '/api/hobbies'),
+    ('hobby_detail', '/api/hobbies/<pk>'),
+
+    # Analytics endpoints
+    ('students_search', '/api/students/search'),
+    ('departments_summary', '/api/analytics/departments/summary'),
+    ('parttime_impact', '/api/analytics/parttime/impact'),
+    ('studytime_performance', '/api/analytics/studytime/performance'),
+    ('risk_list', '/api/analytics/risk'),
+    ('bmi_distribution', '/api/analytics/bmi/distribution'),
+)
+
+# Example URLs (show some potential options for main routes): name -> (endpoint, query string)
+HOME_EXAMPLES = (
+    # Students list is cursor paginated: first page has no cursor, next pages come from its `next` link
+    ('list_students_page_1', 'students', ''),
+    ('stream_all_students', 'students', '?stream=1'),
+    ('search_students', 'students_search', '?department=1&gender=Male&min_college_mark=70&limit=10'),
+    ('department_summary', 'departments_summary', ''),
+    ('risk_list', 'risk_list', '?stress_level=Bad&max_college_mark=60&limit=20'),
+    ('bmi_by_gender', 'bmi_distribution', '?by=gender'),
+)
+
+@lru_cache(maxsize=16)
+def _home_links(base: str) -> tuple[dict[str, str], dict[str, str]]:
+    '''
+    Endpoint and example URLs for one base URL. Only a few hosts are allowed (ALLOWED_HOSTS),
+    so links are built once per host. Returned dicts are shared, never mutate them
+    '''
+    endpoints = {name: base + path for name, path in HOME_ENDPOINT_PATHS}
+    examples = {name: endpoints[endpoint] + query for name, endpoint, query in HOME_EXAMPLES}
+
+    return endpoints, examples
+
+@lru_cache(maxsize=1)
+def _home_static() -> dict:
+    '''
+    Part of the home payload that doesn't depend on the request (built once per process)
+    '''
+    # Only needed here, imported on first use (keeps `platform` out of worker startup)
+    from django import get_version as get_django_version
+    from platform import python_version as get_python_version
+
+    return {
+        'title': 'Student Attitude & Behaviour API',
+        'api_version': '1.0',
+        'python_version': get_python_version(),
+        'django_version': get_django_version(),
+        # Per list endpoint, students use cursor pagination while the rest keep DRF's default
+        'pagination': {
+            endpoint: {
+                'pagination_class': f'{view.pagination_class.__module__}.{view.pagination_class.__qualname__}',
+                'page_size': view.pagination_class.page_size,
+            }
+            for endpoint, view in (
+                ('students', StudentListCreateView),
+                ('departments', DepartmentListCreateView),
+                ('hobbies', HobbyListCreateView),
+            )
+        },
+    }
+
+# Home payload only changes on deploy, let browsers/proxies keep it for a while (unless it shows admin creds)
+HOME_MAX_AGE = 300
+
+def _json_response(body: bytes) -> HttpResponse:
+    '''
+    Plain JSON response for the utility endpoints: always JSON, so DRF's content negotiation and
+    renderer pick (and the browsable API) are skipped
+    '''
+    return HttpResponse(body, content_type='application/json')
+
+# Links are built from the request host. ETag is hashed from the (cheap) body, repeat polls get a 304
+@vary_on_headers('Host')
+@conditional_page
+@require_safe
 def home(request):
     '''
     API home page with discovery links
     '''
     base = request.build_absolute_uri('/')[:-1]
 
-    endpoints = {
-        # Utility
-        'health': f'{base}/api/health/',
-
-        # CRUD endpoints
-        'students': f'{base}/api/students',
-        'student_detail': f'{base}/api/students/<pk>',
-        'departments': f'{base}/api/departments',
-        'department_detail': f'{base}/api/departments/<pk>',
-        'hobbies': f'{base}/api/hobbies',
-        'hobby_detail': f'{base}/api/hobbies/<pk>',
-
-        # Analytics endpoints
-        'students_search': f'{base}/api/students/search',
-        'departments_summary': f'{base}/api/analytics/departments/summary',
-        'parttime_impact': f'{base}/api/analytics/parttime/impact',
-        'studytime_performance': f'{base}/api/analytics/studytime/performance',
-        'risk_list': f'{base}/api/analytics/risk',
-        'bmi_distribution': f'{base}/api/analytics/bmi/distribution',
+    endpoints, examples = _home_links(base)
+
+    payload = {
+        **_home_static(),
+
+        # Extra info
+        'debug': settings.DEBUG,
+
+        # Admin access required
+        'admin': _admin_block(base),
+
+        # Show installed packages used (from requirements.txt)
+        'packages': _requirements(),
+
+        # Hyperlinks to endpoints
+        'endpoints': endpoints,
+        'examples': examples,
     }
 
-    return Response(
-        {
-            'title': 'Student Attitude & Behaviour API',
-            'api_version': '1.0',
-            'python_version': get_python_version(),
-            'django_version': get_django_version(),
-
-            # Extra info
-            'debug': settings.DEBUG,
-            'pagination': {
-                'default_pagination_class': getattr(
-                    settings, 'REST_FRAMEWORK', {}
-                ).get('DEFAULT_PAGINATION_CLASS'),
-                'page_size': getattr(settings, 'REST_FRAMEWORK', {}).get('PAGE_SIZE'),
-            },
-
-            # Admin access required
-            'admin': _admin_block(base),
-
-            # Show installed packages used (from requirements.txt)
-            'packages': _read_requirements(),
-
-            # Hyperlinks to endpoints
-            'endpoints': endpoints,
-
-            # Example URLs (show some potential options for main routes)
-            'examples': {
-                'list_students_page_1': f'{endpoints['students']}?page=1',
-                'search_students': f'{endpoints['students_search']}?department=1&gender=Male&min_college_mark=70&limit=10',
-                'department_summary': endpoints['departments_summary'],
-                'risk_list': f'{endpoints['risk_list']}?stress_level=Bad&max_college_mark=60&limit=20',
-                'bmi_by_gender': f'{endpoints['bmi_distribution']}?by=gender',
-            },
-        }
-    )
-
-
-@api_view(['GET'])
+    response = _json_response(orjson.dumps(payload))
+
+    # Shared caches only get the body when it has no admin credentials in it
+    if _admin_creds():
+        patch_cache_control(response, private=True, no_store=True)
+    else:
+        patch_cache_control(response, public=True, max_age=HOME_MAX_AGE)
+
+    return response
+
+
+# Static body, encoded once. Not cached at HTTP level: a cached `ok` would hide a dead instance from probes
+HEALTH_BODY = orjson.dumps(
+    {
+        'service': 'Student Attitude & Behaviour API',
+        'api_version': '1.0',
+        'status': 'ok',
+    }
+)
+
+HEALTH_ETAG = f'"{hashlib.sha1(HEALTH_BODY).hexdigest()}"'
+
+@condition(etag_func=lambda request: HEALTH_ETAG)
+@require_safe
 def health(request):
-    return Response(
-        {
-            'service': 'Student Attitude & Behaviour API',
-            'api_version': '1.0',
-            'status': 'ok',
-        }
-    )
+    return _json_response(HEALTH_BODY)
 
 
 
 # === STUDENTS CRUD ===
 
-class StudentListCreateView(generics.ListCreateAPIView):
-    queryset = Student.objects.select_related('department', 'hobby').select_related('metrics').all()
+class ValuesListMixin:
+    '''
+    List GET built from .values() rows instead of serializer instances (writes still go through the serializer).
+    Views set `list_values` (columns, serializer's Meta.fields by default) and may override `build_rows`
+    to reshape a page of rows
+    '''
+    list_values: tuple[str, ...] = ()
+    # Rows fetched (and encoded) per chunk when streaming
+    stream_chunk_size = 1000
+
+    def get_list_values(self) -> tuple[str, ...]:
+        # Flat serializers (Department/Hobby) output exactly their model columns
+        return self.list_values or tuple(self.get_serializer_class().Meta.fields)
+
+    def build_rows(self, values_rows):
+        return list(values_rows)
+
+    def stream_rows(self, queryset):
+        '''
+        Yield the whole list as one JSON array, chunk by chunk (rows aren't cached on the queryset)
+        '''
+        yield b'['
+
+        rows = queryset.iterator(chunk_size=self.stream_chunk_size)
+
+        for i, chunk in enumerate(batched(rows, self.stream_chunk_size)):
+            # One dumps() per chunk, array brackets stripped so chunks join into a single array
+            yield (b',' if i else b'') + orjson.dumps(self.build_rows(chunk))[1:-1]
+
+        yield b']'
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset()).values(*self.get_list_values())
+
+        # ?stream=1: all rows unpaginated, memory stays at one chunk however big the table is
+        if request.query_params.get('stream') == '1':
+            return StreamingHttpResponse(self.stream_rows(queryset.order_by('pk')), content_type='application/json')
+
+        page = self.paginate_queryset(queryset)
+
+        if page is not None:
+            return self.get_paginated_response(self.build_rows(page))
+
+        return Response(self.build_rows(queryset))
+
+
+
+# List GETs answer If-None-Match with a 304 while the data version (bumped on every write) is unchanged
+@method_decorator(condition(etag_func=data_version_etag), name='get')
+class StudentListCreateView(ValuesListMixin, generics.ListCreateAPIView):
+    queryset = Student.objects.all()
+    # .values() joins department, hobby and metrics itself, no eager loading needed
+    list_values = STUDENT_LIST_VALUES
+    pagination_class = StudentCursorPagination
+
+    def build_rows(self, values_rows):
+        return student_list_rows(values_rows)
 
     def get_serializer_class(self): # type: ignore[override]
         if self.request.method == 'POST':
@@ -147,7 +294,10 @@ class StudentListCreateView(generics.ListCreateAPIView):
         return StudentReadSerializer
 
 class StudentDetailView(generics.RetrieveUpdateDestroyAPIView):
-    queryset = Student.objects.select_related('department', 'hobby').select_related('metrics').all()
+    queryset = Student.objects.all()
+
+    def get_queryset(self): # type: ignore[override]
+        return StudentReadSerializer.setup_eager_loading(super().get_queryset())
 
     def get_serializer_class(self): # type: ignore[override]
         if self.request.method in ('PUT', 'PATCH'):
@@ -159,51 +309,56 @@ class StudentDetailView(generics.RetrieveUpdateDestroyAPIView):
 
 # === DEPARTMENT CRUD ===
 
-class DepartmentListCreateView(generics.ListCreateAPIView):
-    queryset = Department.objects.all()
-    serializer_class = DepartmentSerializer
-
-
-class DepartmentDetailView(generics.RetrieveUpdateDestroyAPIView):
-    queryset = Department.objects.all()
-    serializer_class = DepartmentSerializer
+class ProtectedDestroyMixin:
+    '''
+    Return 409 on attempt to delete a row that students still reference.
+    Checked up front with a single EXISTS (PROTECT would load every referencing student just to raise),
+    PROTECT and the DB FK still catch a student added in between (ProtectedError / IntegrityError)
+    '''
+    protected_message = 'Cannot delete: this entry is still referenced by one or more students.'
+    protected_relation = 'students'
 
-    # Return error response on attempt to delete protected department (referenced by some mertic)
     def destroy(self, request, *args, **kwargs):
         instance = self.get_object()
 
+        if getattr(instance, self.protected_relation).exists():
+            return Response({'detail': self.protected_message}, status=status.HTTP_409_CONFLICT)
+
         try:
-            self.perform_destroy(instance)
-        except ProtectedError:
-            return Response(
-                {'detail': 'Cannot delete: this department is still referenced by one or more students.'},
-                status=status.HTTP_409_CONFLICT,
-            )
+            # Own savepoint, so a failed DELETE doesn't break an outer transaction
+            with transaction.atomic():
+                self.perform_destroy(instance)
+        except (ProtectedError, IntegrityError):
+            return Response({'detail': self.protected_message}, status=status.HTTP_409_CONFLICT)
 
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 
 
+@method_decorator(condition(etag_func=data_version_etag), name='get')
+class DepartmentListCreateView(ValuesListMixin, generics.ListCreateAPIView):
+    queryset = Department.objects.all()
+    serializer_class = DepartmentSerializer
+
+
+class DepartmentDetailView(ProtectedDestroyMixin, generics.RetrieveUpdateDestroyAPIView):
+    queryset = Department.objects.all()
+    serializer_class = DepartmentSerializer
+
+    protected_message = 'Cannot delete: this department is still referenced by one or more students.'
+
+
+
 # === HOBBIES CRUD ===
 
-class HobbyListCreateView(generics.ListCreateAPIView):
+@method_decorator(condition(etag_func=data_version_etag), name='get')
+class HobbyListCreateView(ValuesListMixin, generics.ListCreateAPIView):
     queryset = Hobby.objects.all()
     serializer_class = HobbySerializer
 
 
-class HobbyDetailView(generics.RetrieveUpdateDestroyAPIView):
+class HobbyDetailView(ProtectedDestroyMixin, generics.RetrieveUpdateDestroyAPIView):
     queryset = Hobby.objects.all()
     serializer_class = HobbySerializer
 
-    # Return error response on attempt to delete protected hobby (referenced by some mertic)
-    def destroy(self, request, *args, **kwargs):
-        instance = self.get_object()
-        try:
-            self.perform_destroy(instance)
-        except ProtectedError:
-            return Response(
-                {'detail': 'Cannot delete: this hobby is still referenced by one or more students.'},
-                status=status.HTTP_409_CONFLICT,
-            )
-
-        return Response(status=status.HTTP_204_NO_CONTENT)
\ No newline at end of file
+    protected_message = 'Cannot delete: this hobby is still referenced by one or more students.'